@@ -38,7 +38,7 @@ _expose = ['show', 'load', 'batch_load',
            'new_viewers',
            'datasets',
            'data_labels']
-_incl = ['enable_hot_reloading', '__version__', 'gca', 'get_all_apps', 'new_app']
+_incl = ['enable_hot_reloading', '__version__', 'gca', 'get_all_apps', 'new_app', 'load_many']
 _temporary_incl = ['LCviz']
 __all__ = _expose + _incl + _temporary_incl
 
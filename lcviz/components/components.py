@@ -225,6 +225,11 @@ class FluxColumnSelect(SelectPluginComponent):
             # TODO: need to think about flatten losing units in the flux column
             return lk_obj[col].unit != u.pix
 
+        if self.dataset.is_multiselect:
+            # a flux column can only be chosen for a single dataset
+            self.choices = []
+            self.selected = ''
+            return
         lk_obj = self.dataset.selected_obj
         if lk_obj is None:
             return
@@ -61,6 +61,45 @@ def light_curve_like_kepler_quarter(seed=42):
     return lc
 
 
+@pytest.fixture
+def dvt_like_hdulist(seed=42):
+    """
+    Generate an HDUList mimicking a TESS DVT file, with one
+    extension per threshold crossing event (TCE).  The first
+    cadence of each TCE has a NaN flux and should be dropped
+    when parsing.
+    """
+    from astropy.io import fits
+
+    rng = np.random.default_rng(seed)
+    n_cadences = 500
+    time = np.linspace(1500, 1527, n_cadences)
+
+    primary = fits.PrimaryHDU()
+    primary.header['TELESCOP'] = 'TESS'
+    primary.header['CREATOR'] = 'DvTimeSeriesExporter'
+    primary.header['OBJECT'] = 'TIC 12345'
+
+    hdus = [primary]
+    for i, period in enumerate((3.1, 5.7), start=1):
+        lc_init = rng.normal(0, 1e-3, n_cadences)
+        lc_init[0] = np.nan
+        hdu = fits.BinTableHDU.from_columns([
+            fits.Column(name='TIME', format='D', array=time),
+            fits.Column(name='PHASE', format='E', array=np.mod(time, period)),
+            fits.Column(name='LC_INIT', format='E', array=lc_init),
+            fits.Column(name='LC_INIT_ERR', format='E', array=np.full(n_cadences, 1e-3)),
+            fits.Column(name='MODEL_INIT', format='E', array=np.zeros(n_cadences)),
+        ])
+        hdu.header['EXTNAME'] = f'TCE_{i}'
+        hdu.header['TUNIT1'] = 'BJD - 2457000, days'
+        hdu.header['TPERIOD'] = period
+        hdu.header['TEPOCH'] = 1501.0
+        hdus.append(hdu)
+
+    return fits.HDUList(hdus)
+
+
 try:
     from pytest_astropy_header.display import PYTEST_HEADER_MODULES, TESTED_VERSIONS
 except ImportError:
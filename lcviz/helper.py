@@ -7,17 +7,18 @@ import ipyvue
 import os
 
 from lightkurve import LightCurve
+from lightkurve.utils import LightkurveError
 
 from glue.config import settings as glue_settings
-from glue.core.link_helpers import LinkSame
 from glue.core.units import unit_converter
 from jdaviz.configs.default.plugins.viewers import JdavizViewerWindow
 from jdaviz.core.helpers import ConfigHelper
 
 from lcviz import __version__
+from lcviz.utils import _TimeLinkRegistry
 from lcviz.viewers import TimeScatterView
 
-__all__ = ['LCviz']
+__all__ = ['LCviz', 'load_many']
 
 
 @unit_converter('custom-lcviz')
@@ -71,17 +72,65 @@ def _link_new_data(app, reference_data=None, data_to_be_linked=None):
     ref_data = dc[reference_data] if reference_data else dc[0]
     linked_data = dc[data_to_be_linked] if data_to_be_linked else dc[-1]
 
-    new_link = LinkSame(
-        cid1=ref_data.world_component_ids[0],
-        cid2=linked_data.world_component_ids[0],
-        data1=ref_data,
-        data2=linked_data,
-        labels1=ref_data.label,
-        labels2=linked_data.label
-    )
+    _TimeLinkRegistry.for_app(app).link([linked_data], reference_data=ref_data)
 
-    dc.add_link(new_link)
-    return
+
+def _parse_for_load(inp):
+    # parse file inputs that lightkurve supports, anything else is passed along to the loaders
+    # infrastructure as-is
+    from lcviz.loaders.parsers.lightkurve import _lkread_supported, lkread
+    if isinstance(inp, (str, os.PathLike)) and _lkread_supported(str(inp)):
+        try:
+            return lkread(str(inp))
+        except LightkurveError:
+            # lightkurve recognized the file type but could not read the file (e.g. a light
+            # curve written by LightCurve.to_fits), fallback on the other parsers available to
+            # the loaders
+            pass
+    return inp
+
+
+def load_many(inputs, data_labels=None, max_workers=None, helper=None, **kwargs):
+    """
+    Load multiple light curves or target pixel files (e.g. all sectors or quarters of a target).
+
+    File inputs are parsed concurrently and then all entries are added to the data collection
+    in a single ``batch_load``, so that linking, updating phase arrays, and adding data to
+    viewers each only happen once.
+
+    Parameters
+    ----------
+    inputs : list
+        File names or `~lightkurve.LightCurve`/`~lightkurve.targetpixelfile.TargetPixelFile`
+        objects.
+    data_labels : list or `None`
+        Data labels for each entry in ``inputs``.  If not provided, these are determined
+        automatically.
+    max_workers : int or `None`
+        Maximum number of threads used for parsing.  Defaults to the number of available cores.
+    helper : `~jdaviz.core.helpers.ConfigHelper` or `None`
+        Helper to load the data into.  Defaults to the current app (see ``gca``).
+    **kwargs :
+        Additional kwargs are passed to ``load`` for each entry.
+    """
+    from lcviz.utils import _parallel_map
+    if helper is None:
+        from jdaviz import gca
+        helper = gca()
+    inputs = list(inputs)
+    if data_labels is None:
+        data_labels = [None] * len(inputs)
+    elif len(data_labels) != len(inputs):
+        raise ValueError("data_labels must have the same length as inputs")
+
+    parsed = _parallel_map(_parse_for_load, inputs, max_workers=max_workers)
+
+    with helper.batch_load():
+        for inp, data_label in zip(parsed, data_labels):
+            if data_label is not None:
+                helper.load(inp, data_label=data_label, **kwargs)
+            else:
+                helper.load(inp, **kwargs)
 
 
 def _get_display_unit(app, axis):
@@ -253,6 +302,15 @@ class LCviz(ConfigHelper):
 
         self.load(data, data_label=data_label, format=['Light Curve', 'TPF'], **kwargs)
 
+    def load_many(self, inputs, data_labels=None, max_workers=None, **kwargs):
+        """
+        Load multiple light curves or target pixel files, parsing files concurrently and
+        adding all entries to the data collection in a single batch.  See
+        `~lcviz.helper.load_many` for details.
+        """
+        load_many(inputs, data_labels=data_labels, max_workers=max_workers, helper=self,
+                  **kwargs)
+
     def get_data(self, data_label=None, cls=LightCurve, subset=None):
         """
         Returns data with name equal to data_label of type cls with subsets applied from
@@ -1,6 +1,6 @@
 import os
 import numpy as np
-from functools import cached_property
+from functools import cached_property, partial
 from traitlets import Any, Bool, List, Unicode, observe
 from astropy.io import fits
 from astropy.table import Table
@@ -13,7 +13,7 @@ from jdaviz.core.registries import loader_importer_registry
 from jdaviz.core.loaders.importers import BaseImporterToDataCollection
 from jdaviz.core.template_mixin import SelectFileExtensionComponent
 from jdaviz.core.user_api import ImporterUserApi
-from lcviz.utils import _data_with_reftime
+from lcviz.utils import LazyComponent, _data_with_reftime, _parallel_map
 
 
 __all__ = ['LightCurveImporter']
@@ -48,49 +48,124 @@ def hdu_is_valid(hdu):
     return False
 
 
+# columns that may conflict with components generated later by lcviz, and so are not loaded
+_skip_columns = ('PHASE', 'CADENCENO')
+
+
+def _fits_column(fits_data, name, rows=None):
+    # for memory-mapped files, this is a view into the file until ``rows`` are applied
+    values = fits_data[name]
+    return values if rows is None else values[rows]
+
+
 def hdulist_to_lightcurve(pri_header, hdu):
-    if 'LC_INIT' in hdu.columns.names:
+    """
+    Convert a light curve HDU to a `~lightkurve.LightCurve`.
+
+    Other than the time, flux, flux uncertainty, and quality columns, 1-dimensional numeric
+    columns are not read when parsing.  Instead they are stored in the ``_lcviz_lazy_components``
+    attribute as `~lcviz.utils.LazyComponent` objects, which are only read from the
+    (memory-mapped) HDU when accessed after the light curve is added to the data collection.
+
+    Parameters
+    ----------
+    pri_header : `~astropy.io.fits.Header`
+        Header of the primary HDU.
+    hdu : `~astropy.io.fits.BinTableHDU`
+        The light curve HDU (see ``hdu_is_valid``).
+
+    Returns
+    -------
+    lc : `~lightkurve.LightCurve`
+    """
+    fits_data = hdu.data
+    colnames = [col for col in hdu.columns.names if col not in _skip_columns]
+    if 'LC_INIT' in colnames:
         # TESS DVT format
-        data = Table(hdu.data)
-        # don't load some columns with names that may
-        # conflict with components generated later by lcviz
-        for col in ('PHASE', 'CADENCENO'):
-            if col in data.columns:
-                data.remove_column(col)
+        flux_col, flux_err_col = 'LC_INIT', 'LC_INIT_ERR'
         # Remove rows that have NaN data
-        data = data[~np.isnan(data['LC_INIT'])]
+        rows = ~np.isnan(fits_data[flux_col])
+    else:
+        # Generic lightkurve FITS format (TIME + FLUX columns)
+        flux_col, flux_err_col = 'FLUX', 'FLUX_ERR'
+        rows = None
+
+    # only 1-dimensional numeric columns are deferred, all others (e.g. strings or booleans) are
+    # read now so that they are converted to the appropriate glue component type.  The dtypes
+    # are those after applying any scaling (e.g. TZERO for unsigned integers), determined by
+    # decoding an empty slice of the table.
+    decoded = fits_data[:0]
+    lazy_cols = [col for col in colnames
+                 if col not in ('TIME', flux_col, flux_err_col, 'QUALITY')
+                 and decoded[col].ndim == 1 and decoded[col].dtype.kind in 'iuf']
+    eager_cols = [col for col in colnames if col not in lazy_cols]
+    data = Table({col: _fits_column(fits_data, col, rows) for col in eager_cols})
+    n_rows = len(data)
+
+    if flux_col == 'LC_INIT':
         time_offset = int(hdu.header['TUNIT1'].split('- ')[1].split(',')[0])
         data['TIME'] += time_offset
-        lc = LightCurve(data=data,
-                        time=data['TIME'],
-                        flux=data['LC_INIT'],
-                        flux_err=data['LC_INIT_ERR'])
-        lc.meta = dict(pri_header)
-        lc.meta = lc.meta | dict(hdu.header)
+
+    flux_err = data[flux_err_col] if flux_err_col in data.columns else None
+    lc = LightCurve(data=data,
+                    time=data['TIME'],
+                    flux=data[flux_col],
+                    flux_err=flux_err)
+    lc.meta = dict(pri_header)
+    lc.meta = lc.meta | dict(hdu.header)
+    if flux_col == 'LC_INIT':
         lc.meta['MISSION'] = 'TESS DVT'
         lc.meta['FLUX_ORIGIN'] = "LC_INIT"
         lc.meta['EXTNAME'] = hdu.header['EXTNAME']
-    else:
-        # Generic lightkurve FITS format (TIME + FLUX columns)
-        data = Table(hdu.data)
-        for col in ('PHASE', 'CADENCENO'):
-            if col in data.columns:
-                data.remove_column(col)
-        flux_err = data['FLUX_ERR'] if 'FLUX_ERR' in data.columns else None
-        lc = LightCurve(data=data,
-                        time=data['TIME'],
-                        flux=data['FLUX'],
-                        flux_err=flux_err)
-        lc.meta = dict(pri_header)
-        lc.meta = lc.meta | dict(hdu.header)
+
+    # units are not set, consistent with reading the columns through an astropy Table
+    lc._lcviz_lazy_components = {
+        col: LazyComponent(partial(_fits_column, fits_data, col, rows),
+                           shape=(n_rows,), dtype=decoded[col].dtype, units='None')
+        for col in lazy_cols
+    }
 
     return lc
 
 
+def hdulist_to_lightcurves(pri_header, hdus, max_workers=None):
+    """
+    Convert multiple light curve HDUs (i.e. the TCE extensions of a TESS DVT file) to
+    `~lightkurve.LightCurve` objects, parsing the extensions concurrently.
+
+    Parameters
+    ----------
+    pri_header : `~astropy.io.fits.Header`
+        Header of the primary HDU.
+    hdus : list of `~astropy.io.fits.BinTableHDU`
+        The light curve HDUs (see ``hdu_is_valid``).
+    max_workers : int, optional
+        Maximum number of threads.  Defaults to the number of available cores.
+
+    Returns
+    -------
+    lcs : list of `~lightkurve.LightCurve`
+        In the same order as ``hdus``.
+    """
+    hdus = list(hdus)
+    # load the data of each HDU (the ``data`` attribute is lazy) before dispatching to threads,
+    # since (for files that are not memory-mapped) reading the data seeks within the shared
+    # file object
+    for hdu in hdus:
+        _ = hdu.data
+
+    return _parallel_map(partial(hdulist_to_lightcurve, pri_header), hdus,
+                         max_workers=max_workers)
+
+
 def has_ephem(lc):
-    return ('TPERIOD' in lc.meta and
-            'TEPOCH' in lc.meta and
-            'TUNIT1' in lc.meta)
+    return header_has_ephem(lc.meta)
+
+
+def header_has_ephem(*headers):
+    # checks the header(s) directly, without needing to parse the HDU into a light curve
+    return all(any(key in header for header in headers)
+               for key in ('TPERIOD', 'TEPOCH', 'TUNIT1'))
 
 
 @loader_importer_registry('Light Curve')
@@ -180,15 +255,20 @@ class LightCurveImporter(BaseImporterToDataCollection):
         if not hasattr(self, 'extension') or not self.input_hdulist:
             return
 
+        # output is only (re)built when needed for importing
         self._clear_cache('output')
 
+        # determine available options from the headers alone (without parsing the data)
+        pri_header = self.input[0].header
         if self.extension_multiselect:
-            self.data_label_default = self.input[0].header.get('OBJECT') or 'Light curve'
-            self.create_ephemeris_available = any([has_ephem(lc) for lc in self.output])
+            self.data_label_default = pri_header.get('OBJECT') or 'Light curve'
+            self.create_ephemeris_available = any([header_has_ephem(pri_header, hdu.header)
+                                                   for hdu in self.extension.selected_obj])
         else:
-            obj_name = self.input[0].header.get('OBJECT') or 'Light curve'
+            obj_name = pri_header.get('OBJECT') or 'Light curve'
             self.data_label_default = f"{obj_name} [{self.extension.selected_item['name']}]"  # noqa
-            self.create_ephemeris_available = has_ephem(self.output)
+            self.create_ephemeris_available = header_has_ephem(pri_header,
+                                                               self.extension.selected_obj.header)
 
     @staticmethod
     def _get_supported_viewers():
@@ -202,7 +282,7 @@ class LightCurveImporter(BaseImporterToDataCollection):
             # HDUList case
             pri_header = self.input[0].header
             if self.extension_multiselect:
-                lc = [hdulist_to_lightcurve(pri_header, hdu) for hdu in self.extension.selected_obj]
+                lc = hdulist_to_lightcurves(pri_header, self.extension.selected_obj)
             else:
                 lc = hdulist_to_lightcurve(pri_header, self.extension.selected_obj)
 
@@ -228,6 +308,7 @@ class LightCurveImporter(BaseImporterToDataCollection):
     def __call__(self):
         if self.input_hdulist and self.extension_multiselect:
             data_label = self.data_label_value
+            # all extensions are parsed (concurrently) before adding any to the data collection
             lcs = self.output
             with self._app._jdaviz_helper.batch_load():
                 for lc, ext in zip(lcs, self.extension.selected_name):
@@ -1,5 +1,8 @@
 from functools import cached_property
+import lightkurve
+from astropy.io import fits
 from lightkurve import read as lkread
+from lightkurve.io.detect import detect_filetype
 
 from jdaviz.core.loaders.parsers import BaseParser
 from jdaviz.core.registries import loader_parser_registry
@@ -7,6 +10,35 @@ from jdaviz.core.registries import loader_parser_registry
 
 __all__ = ['LightkurveParser']
 
+# file types detected by lightkurve that lightkurve.read handles without a class of the same name.
+# NOTE: this mirrors the if/elif dispatch in lightkurve.io.read.read (as of lightkurve 2.6) and
+# must be updated if lightkurve adds formats (see test_lkread_filetypes_match_lightkurve)
+_lkread_filetypes = ('QLP', 'ELEANOR', 'PATHOS', 'CDIPS', 'TASOC', 'K2SFF', 'EVEREST',
+                     'KEPSEISMIC', 'TGLC', 'Folded', 'generic')
+
+
+def _detect_filetype(path_or_hdulist):
+    # only the headers (TELESCOP, CREATOR, EXTNAME, column names, etc) are inspected, the data
+    # itself is not read
+    if isinstance(path_or_hdulist, fits.HDUList):
+        return detect_filetype(path_or_hdulist)
+    kwargs = {}
+    if isinstance(path_or_hdulist, str) and path_or_hdulist.startswith('s3://'):
+        kwargs = {'use_fsspec': True, 'fsspec_kwargs': {'anon': True}}
+    with fits.open(path_or_hdulist, lazy_load_hdus=True, **kwargs) as hdulist:
+        return detect_filetype(hdulist)
+
+
+def _lkread_supported(path_or_hdulist):
+    # whether lightkurve.read supports the input, determined from the headers alone
+    try:
+        filetype = _detect_filetype(path_or_hdulist)
+    except Exception:
+        return False
+    if filetype is None:
+        return False
+    return filetype in _lkread_filetypes or hasattr(lightkurve, filetype)
+
 
 @loader_parser_registry('lightkurve.read')
 class LightkurveParser(BaseParser):
@@ -15,11 +47,9 @@ class LightkurveParser(BaseParser):
     def is_valid(self):
         if self._app.config not in ('lcviz', 'deconfigged'):
             return False
-        try:
-            self.output
-        except Exception:
-            return False
-        return True
+        # sniff the file type from the headers rather than reading the full file, the full
+        # read is deferred until output is accessed
+        return _lkread_supported(self.input)
 
     @cached_property
     def output(self):
@@ -1,4 +1,12 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import quote, urlparse
+
 import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
 
 from astropy.coordinates import SkyCoord
 from astropy import units as u
@@ -6,7 +14,7 @@ from astropy.table import Table as AstropyTable
 
 from lightkurve import search_lightcurve, search_targetpixelfile
 
-from traitlets import Unicode, List
+from traitlets import Bool, Unicode, List
 
 from jdaviz.core.registries import loader_resolver_registry
 from jdaviz.core.template_mixin import (
@@ -17,8 +25,58 @@ from jdaviz.core.loaders.resolvers import BaseConeSearchResolver
 from jdaviz.core.user_api import LoaderUserApi
 from jdaviz.core.events import SnackbarMessage
 
+from lcviz.helper import load_many
+from lcviz.utils import _DiskCache
+
 __all__ = ["LightkurveResolver"]
 
+# name resolutions and archive search results, re-used for up to a day (or indefinitely
+# when offline)
+_query_cache = _DiskCache('lightkurve_queries', ttl=24 * 60 * 60)
+
+# directory of downloaded products, defaults to the lcviz subdirectory of the astropy cache
+_product_cache_dir = None
+
+# maximum number of concurrent product downloads
+_max_download_workers = 4
+
+
+def _get_product_cache_dir():
+    if _product_cache_dir is None:
+        from astropy.config import get_cache_dir_path
+        return get_cache_dir_path('lcviz') / 'products'
+    return Path(_product_cache_dir)
+
+
+def _product_cache_path(uri):
+    # products are stored by the hash of their URI, while retaining the original filename so that
+    # the file type can still be inferred
+    key = hashlib.sha256(uri.encode()).hexdigest()
+    filename = os.path.basename(urlparse(uri).path) or 'product'
+    return _get_product_cache_dir() / key[:2] / key / filename
+
+
+def _product_url(uri):
+    if uri.startswith('mast:'):
+        return f"https://mast.stsci.edu/api/v0.1/Download/file?uri={quote(uri, safe=':/')}"
+    return uri
+
+
+def _download_product(session, uri, path, timeout=None):
+    # download to a temporary file first so that interrupted downloads are never cached
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        with session.get(_product_url(uri), stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
+
 
 @loader_resolver_registry("lightkurve")
 class LightkurveResolver(BaseConeSearchResolver):
@@ -30,6 +88,8 @@ class LightkurveResolver(BaseConeSearchResolver):
     data_type_items = List([]).tag(sync=True)
     data_type_selected = Unicode().tag(sync=True)
 
+    offline = Bool(False).tag(sync=True)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -46,6 +106,10 @@ class LightkurveResolver(BaseConeSearchResolver):
             manual_options=['Light Curve', 'Target Pixel File']
         )
 
+        # multiple products can be selected and are then downloaded concurrently and
+        # loaded together (see ``load``)
+        self.file_table.multiselect = True
+
     @property
     def user_api(self):
         return LoaderUserApi(
@@ -54,15 +118,37 @@ class LightkurveResolver(BaseConeSearchResolver):
                 "viewer", "coordframe", "radius", "radius_unit",
                 "source",
                 "mission", "data_type",
-                "max_results",
-                "query_archive"
+                "max_results", "offline",
+                "query_archive", "clear_query_cache",
+                "download_products"
             ],
         )
 
+    def _cached_query(self, key, query):
+        # use the cached result if available, otherwise call ``query`` and cache the result
+        result = _query_cache.get(key, ignore_ttl=self.offline)
+        if result is not None:
+            return result
+        if self.offline:
+            raise ValueError("no cached result is available while offline")
+        result = query()
+        _query_cache.set(key, result)
+        return result
+
+    def clear_query_cache(self):
+        """
+        Clear all cached name resolutions and archive search results.
+        """
+        _query_cache.clear()
+
     @with_spinner(spinner_traitlet="results_loading")
     def query_archive(self):
+        frame = self.coordframe.selected
         try:
-            skycoord_center = SkyCoord.from_name(self.source, frame=self.coordframe.selected)
+            skycoord_center = self._cached_query(
+                ('from_name', self.source, frame),
+                lambda: SkyCoord.from_name(self.source, frame=frame)
+            )
         except Exception as e:
             self.hub.broadcast(SnackbarMessage(
                 f"Unable to resolve source coordinates: {self.source}",
@@ -72,23 +158,26 @@ class LightkurveResolver(BaseConeSearchResolver):
 
         radius = self.radius * u.Unit(self.radius_unit.selected)
 
+        if self.data_type.selected == 'Light Curve':
+            search_func = search_lightcurve
+        elif self.data_type.selected == 'Target Pixel File':
+            search_func = search_targetpixelfile
+        else:
+            search_func = None
+
         try:
-            if self.data_type.selected == 'Light Curve':
-                output = search_lightcurve(
-                    target=skycoord_center,
-                    radius=radius,
-                    mission=self.mission.selected,
-                    limit=self.max_results,
-                )
-            elif self.data_type.selected == 'Target Pixel File':
-                output = search_targetpixelfile(
+            if search_func is None:
+                raise NotImplementedError("Data type not recognized.")
+            output = self._cached_query(
+                ('search', self.data_type.selected, self.source, frame,
+                 radius.value, radius.unit.to_string(), self.mission.selected, self.max_results),
+                lambda: search_func(
                     target=skycoord_center,
                     radius=radius,
                     mission=self.mission.selected,
                     limit=self.max_results,
                 )
-            else:
-                raise NotImplementedError("Data type not recognized.")
+            )
         except Exception as e:
             self.hub.broadcast(SnackbarMessage(
                 f"Lightkurve archive query failed: {e}",
@@ -117,32 +206,107 @@ class LightkurveResolver(BaseConeSearchResolver):
         The SearchResult's internal table contains many columns with masked or
         mixed types that cause type-inference failures when added row-by-row to
         jdaviz's QTable. This method selects only the display-relevant columns
-        and converts every value to a plain Python scalar so astropy can infer
-        consistent dtypes.
+        and converts each to a plain (unmasked) array so astropy can infer
+        consistent dtypes, replacing masked entries with empty strings.
         """
         t = search_result.table
         keep = ['#', 'target_name', 'obs_collection', 'author',
                 'year', 'description', 'exptime', 'dataURI']
         cols = [c for c in keep if c in t.colnames]
 
-        rows = []
-        for row in t:
-            clean = {}
-            for c in cols:
-                val = row[c]
-                # Convert masked scalars and numpy scalars to plain Python types
-                if val is np.ma.masked:
-                    clean[c] = ''
-                elif hasattr(val, 'item'):  # numpy scalar
-                    try:
-                        clean[c] = val.item()
-                    except Exception:
-                        clean[c] = str(val)
-                else:
-                    clean[c] = val
-            rows.append(clean)
-
-        return AstropyTable(rows=rows) if rows else AstropyTable(names=cols)
+        if not len(t):
+            return AstropyTable(names=cols)
+
+        columns = {}
+        for c in cols:
+            col = t[c]
+            mask = np.ma.getmaskarray(col)
+            if col.dtype.kind == 'O':
+                # let numpy infer the type from the (python) values
+                values = np.array([val if not m else '' for val, m in zip(col, mask)])
+            elif mask.any():
+                values = np.where(mask, '', np.asarray(col).astype(str))
+            else:
+                values = np.asarray(col)
+            columns[c] = values
+
+        return AstropyTable(columns)
+
+    def download_products(self, uris=None):
+        """
+        Download products (concurrently) to the local product cache, skipping any that are
+        already cached.
+
+        Parameters
+        ----------
+        uris : list of str, optional
+            URIs/URLs of the products.  Defaults to the locations of the selected rows in the
+            file table.
+
+        Returns
+        -------
+        paths : list of str
+            Local paths to the products, in the same order as ``uris``.
+        """
+        if uris is None:
+            uris = [row['location'] for row in self.file_table.selected_rows]
+
+        paths = []
+        to_download = []
+        for uri in uris:
+            if os.path.isfile(uri):
+                paths.append(uri)
+                continue
+            path = _product_cache_path(uri)
+            paths.append(str(path))
+            # the cache is always checked first (unless disabled) to avoid any network access
+            if not (self.file_cache and path.is_file()):
+                to_download.append((uri, path))
+
+        if len(to_download):
+            if self.offline:
+                raise ValueError(f"{len(to_download)} product(s) are not cached and cannot be "
+                                 "downloaded while offline")
+            n_workers = min(_max_download_workers, len(to_download))
+            self.spinner = f'downloading products (0/{len(to_download)})...'
+            try:
+                with requests.Session() as session:
+                    adapter = HTTPAdapter(pool_connections=n_workers, pool_maxsize=n_workers)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                        futures = [executor.submit(_download_product, session, uri, path,
+                                                   self.file_timeout)
+                                   for uri, path in to_download]
+                        for n_complete, future in enumerate(as_completed(futures), start=1):
+                            future.result()
+                            self.spinner = (f'downloading products '
+                                            f'({n_complete}/{len(to_download)})...')
+            finally:
+                self.spinner = ''
+
+        return paths
+
+    @with_spinner('spinner', 'downloading file...')
+    def _download_from_file_table(self):
+        if not len(self.file_table.selected_rows):
+            return None
+        # download all selected products (concurrently) so that they are available when loading,
+        # but only pass the first on to the parsers to determine the available formats
+        return self.download_products()[0]
+
+    def load(self):
+        """
+        Import into lcviz with all selected options.  If multiple products are selected, they
+        are all loaded (with the selected format) in a single batch.
+        """
+        if len(self.file_table.selected_rows) <= 1:
+            return super().load()
+        paths = self.download_products()
+        # label by filename, since the default labels (from the target name) may not be unique
+        data_labels = [Path(path).name.split('.')[0] for path in paths]
+        load_many(paths, data_labels=data_labels, helper=self._app._jdaviz_helper,
+                  format=self.format.selected)
 
     def vue_query_archive(self, _=None):
         self.query_archive()
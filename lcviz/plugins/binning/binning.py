@@ -1,12 +1,14 @@
 from astropy.time import Time
-from traitlets import Bool, observe
+from traitlets import Bool, List, Unicode, observe
 from glue.config import data_translator
+from glue.core.message import DataCollectionDeleteMessage, NumericalDataChangedMessage
 
 from jdaviz.core.custom_traitlets import IntHandleEmpty
 from jdaviz.core.events import (ViewerAddedMessage, ViewerRemovedMessage)
 from jdaviz.core.registries import tray_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin,
                                         DatasetSelectMixin, AddResultsMixin,
+                                        SelectPluginComponent,
                                         skip_if_no_updates_since_last_active,
                                         with_spinner, with_temp_disable)
 from jdaviz.core.user_api import PluginUserApi
@@ -16,7 +18,8 @@ from lcviz.events import EphemerisChangedMessage
 from lcviz.marks import LivePreviewBinning
 from lcviz.viewers import TimeScatterView, PhaseScatterView
 from lcviz.components import EphemerisSelectAllowNoneMixin
-from lcviz.utils import is_lc, phase_comp_lbl, _data_with_reftime
+from lcviz.utils import (is_lc, phase_comp_lbl, _data_with_reftime, _BinPrefixSums,
+                         _BIN_STATISTICS, _CoalescedCall)
 
 
 __all__ = ['Binning']
@@ -41,6 +44,9 @@ class Binning(PluginTemplateMixin, FluxColumnSelectMixin, DatasetSelectMixin,
     * :meth:`input_lc`
       Data used as input to binning, based on ``dataset`` and ``ephemeris``.
     * ``n_bins`` : int
+    * ``statistic`` (:class:`~jdaviz.core.template_mixin.SelectPluginComponent`):
+      Statistic of the flux in each bin: 'mean', 'weighted mean' (by the inverse variance of the
+      flux uncertainties), or 'median'.
     * ``add_results`` (:class:`~jdaviz.core.template_mixin.AddResults`)
     * :meth:`bin`
     """
@@ -50,14 +56,28 @@ class Binning(PluginTemplateMixin, FluxColumnSelectMixin, DatasetSelectMixin,
     show_live_preview = Bool(True).tag(sync=True)
 
     n_bins = IntHandleEmpty(100).tag(sync=True)
+    statistic_items = List().tag(sync=True)
+    statistic_selected = Unicode().tag(sync=True)
     bin_enabled = Bool(True).tag(sync=True)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._plugin_description = 'Bin input light curve.'
 
+        self.statistic = SelectPluginComponent(self,
+                                               items='statistic_items',
+                                               selected='statistic_selected',
+                                               manual_options=list(_BIN_STATISTICS))
+
         self._set_results_viewer()
 
+        # sorted samples and cumulative sums of the input light curve, as
+        # ((dataset, flux column, ephemeris), _BinPrefixSums), so that changing n_bins or the
+        # statistic does not re-read (or re-phase) the input
+        self._bin_index = None
+        # sweeping n_bins (e.g. with the slider) updates the live preview at most once per frame
+        self._marks_update = _CoalescedCall(self._update_marks)
+
         # TODO: replace with add_filter('not_from_this_plugin') if upstream PR accepted/released
         # https://github.com/spacetelescope/jdaviz/pull/2239
         def not_from_binning_plugin(data):
@@ -68,6 +88,8 @@ class Binning(PluginTemplateMixin, FluxColumnSelectMixin, DatasetSelectMixin,
         self.hub.subscribe(self, ViewerAddedMessage, handler=self._on_add_viewer)
         self.hub.subscribe(self, ViewerRemovedMessage, handler=self._set_results_viewer)
         self.hub.subscribe(self, EphemerisChangedMessage, handler=self._on_ephemeris_update)
+        self.hub.subscribe(self, NumericalDataChangedMessage, handler=self._on_data_changed)
+        self.hub.subscribe(self, DataCollectionDeleteMessage, handler=self._on_data_changed)
 
         self._set_relevant()
 
@@ -81,7 +103,7 @@ class Binning(PluginTemplateMixin, FluxColumnSelectMixin, DatasetSelectMixin,
     @property
     def user_api(self):
         expose = ['show_live_preview', 'dataset', 'ephemeris', 'input_lc',
-                  'n_bins', 'add_results', 'bin']
+                  'n_bins', 'statistic', 'add_results', 'bin']
         return PluginUserApi(self, expose=expose)
 
     @property
@@ -169,19 +191,19 @@ class Binning(PluginTemplateMixin, FluxColumnSelectMixin, DatasetSelectMixin,
 
     @observe('flux_column_selected', 'dataset_selected',
              'ephemeris_selected',
-             'n_bins', 'previews_temp_disabled')
+             'n_bins', 'statistic_selected', 'previews_temp_disabled')
     @skip_if_no_updates_since_last_active()
-    @with_temp_disable(timeout=0.3)
     def _live_update(self, event={}):
         self.bin_enabled = self.n_bins != '' and self.n_bins > 0
+        self._marks_update()
 
+    @with_temp_disable(timeout=0.3)
+    def _update_marks(self):
         if not self.show_live_preview or not self.is_active or not self.bin_enabled:
             self._clear_marks()
             return
 
-        if event.get('name', '') not in ('is_active', 'show_live_preview'):
-            # mark visibility hasn't been handled yet
-            self._toggle_marks()
+        self._toggle_marks()
 
         try:
             lc = self.bin(add_data=False)
@@ -215,7 +237,14 @@ class Binning(PluginTemplateMixin, FluxColumnSelectMixin, DatasetSelectMixin,
                 mark.times = []
                 mark.update_xy(times, lc.flux.value)
 
+    def _on_data_changed(self, msg):
+        if self._bin_index is not None and msg.data.label == self._bin_index[0][0]:
+            self._bin_index = None
+
     def _on_ephemeris_update(self, msg):
+        if self._bin_index is not None and msg.ephemeris_label == self._bin_index[0][2]:
+            self._bin_index = None
+
         if not self.show_live_preview or not self.is_active:
             return
 
@@ -224,19 +253,27 @@ class Binning(PluginTemplateMixin, FluxColumnSelectMixin, DatasetSelectMixin,
 
         self._live_update()
 
+    def _get_bin_index(self):
+        key = (self.dataset_selected, self.flux_column_selected, self.ephemeris_selected)
+        if self._bin_index is None or self._bin_index[0] != key:
+            input_lc = self.input_lc
+
+            # fix for bug in py310, see:
+            # https://github.com/spacetelescope/lcviz/pull/194
+            if "NORMALIZE_PHASE" not in input_lc.meta:
+                input_lc.meta["NORMALIZE_PHASE"] = False
+
+            self._bin_index = (key, _BinPrefixSums(input_lc))
+        return self._bin_index[1]
+
     @with_spinner()
     def bin(self, add_data=True):
         if self.n_bins == '' or self.n_bins <= 0:
             raise ValueError("n_bins must be a positive integer")
 
-        input_lc = self.input_lc
-
-        # fix for bug in py310, see:
-        # https://github.com/spacetelescope/lcviz/pull/194
-        if "NORMALIZE_PHASE" not in input_lc.meta:
-            input_lc.meta["NORMALIZE_PHASE"] = False
-
-        lc = input_lc.bin(time_bin_size=(input_lc.time[-1]-input_lc.time[0]).value/self.n_bins)
+        bin_index = self._get_bin_index()
+        lc = bin_index.bin(self.n_bins, statistic=self.statistic_selected)
+        input_lc = bin_index.template
         if self.ephemeris_selected != 'No ephemeris':
             # lc.time.value are actually phases, so convert to times starting at time t0
             times = self.ephemeris_plugin.phases_to_times(lc.time.value, self.ephemeris_selected)
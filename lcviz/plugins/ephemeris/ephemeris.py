@@ -1,28 +1,34 @@
+import concurrent.futures
+import threading
+
 import numpy as np
 from astropy.coordinates import SkyCoord
+from astropy.table import QTable, Table
 from astropy.time import Time
 import astropy.units as u
 from astroquery.ipac.nexsci.nasa_exoplanet_archive import NasaExoplanetArchive
 
 from traitlets import Bool, Float, List, Unicode, observe
 
-from glue.core.link_helpers import LinkSame
-from glue.core.message import DataCollectionAddMessage
+from glue.core.component_id import ComponentID
+from glue.core.decorators import clear_cache
+from glue.core.message import DataCollectionAddMessage, NumericalDataChangedMessage
 from jdaviz.configs.default.plugins.viewers import JdavizViewerWindow
 from jdaviz.core.custom_traitlets import FloatHandleEmpty
-from jdaviz.core.events import (NewViewerMessage, ViewerAddedMessage, ViewerRemovedMessage)
+from jdaviz.core.events import (NewViewerMessage, ViewerAddedMessage, ViewerRemovedMessage,
+                                ExitBatchLoadMessage)
 from jdaviz.core.registries import tray_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin, DatasetSelectMixin,
-                                        SelectPluginComponent, EditableSelectPluginComponent,
-                                        with_spinner)
+                                        SelectPluginComponent, EditableSelectPluginComponent)
 from jdaviz.core.user_api import PluginUserApi
 from jdaviz.core.events import SnackbarMessage
 
-from lightkurve import periodogram, FoldedLightCurve, LightCurve
+from lightkurve import FoldedLightCurve, LightCurve
 
 from lcviz.events import EphemerisComponentChangedMessage, EphemerisChangedMessage
 from lcviz.viewers import TimeScatterView, PhaseScatterView
-from lcviz.utils import is_lc, is_not_tpf, phase_comp_lbl
+from lcviz.utils import (is_lc, is_not_tpf, phase_comp_lbl, LazyComponent, _DiskCache,
+                         _CoalescedCall, _TimeLinkRegistry, _periodogram_cache)
 
 __all__ = ['Ephemeris']
 
@@ -33,6 +39,21 @@ _default_wrap_at = 1.0
 
 _default_query_radius = 2  # [arcsec]
 
+# persistent cache of NASA Exoplanet Archive (pscomppars) query results, keyed by object name or
+# by the rounded coordinates and radius of the query, and (if seeded) of a local copy of the
+# full table (see ``Ephemeris.seed_query_cache``)
+_query_cache = _DiskCache('exoplanet_archive_queries', ttl=7 * 24 * 60 * 60)
+_query_coord_decimals = 4  # [deg], i.e. ~0.4 arcsec
+_seed_key = 'pscomppars'
+
+# single worker so that superseded periodogram requests that have not yet started can be cancelled
+_periodogram_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+
+def _to_days(value):
+    # archive query results may contain masked quantities
+    return getattr(value, 'unmasked', value).to_value(u.day)
+
 
 @tray_registry('ephemeris', label="Ephemeris", category='data:analysis')
 class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
@@ -81,6 +102,8 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
     * :meth:`create_ephemeris_from_query`
       Create an ephemeris component with the period and epoch from
       the planet selected from the NASA Exoplanet Archive query in ``query_result``.
+    * :meth:`seed_query_cache`
+    * :meth:`clear_query_cache`
     """
     template_file = __file__, "ephemeris.vue"
 
@@ -132,6 +155,17 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
         self._ephemerides = {}
         self._prev_wrap_at = _default_wrap_at
         self._nasa_exoplanet_archive = None
+        # version (ephemeris parameters and time coordinates) used for the current phase array
+        # of each (data uuid, ephemeris component) pair, see _update_all_phase_arrays
+        self._phase_versions = {}
+        self._phase_update_pending = False
+        # ephemeris components with changes from the front-end (e.g. dragging a slider) that are
+        # not yet applied to the phase arrays, see _ephem_traitlet_changed
+        self._ephem_updates_pending = set()
+        self._ephem_update = _CoalescedCall(self._apply_pending_ephem_updates)
+        # periodogram computed in the background for period_at_max_power, see _update_periodogram
+        self._periodogram_future = None
+        self._periodogram_request = 0
 
         self.dataset.get_data_cls = LightCurve
         self.dataset.add_filter(is_lc)
@@ -160,9 +194,8 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
                                                   items='query_result_items',
                                                   selected='query_result_selected')
 
-        # TODO: could optimize by only updating for the new data entry only
-        # (would require some refactoring and probably wouldn't have significant gains)
-        self.hub.subscribe(self, DataCollectionAddMessage, handler=self._update_all_phase_arrays)
+        self.hub.subscribe(self, DataCollectionAddMessage, handler=self._on_data_added)
+        self.hub.subscribe(self, ExitBatchLoadMessage, handler=self._on_exit_batch_load)
         self.hub.subscribe(self, ViewerAddedMessage, handler=self._check_if_phase_viewer_exists)
         self.hub.subscribe(self, ViewerRemovedMessage, handler=self._check_if_phase_viewer_exists)
 
@@ -186,7 +219,8 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
             'dataset', 'method', 'period_at_max_power',
             'adopt_period_at_max_power',
             'query_name', 'query_ra', 'query_dec', 'query_radius',
-            'query_for_ephemeris', 'query_result', 'create_ephemeris_from_query'
+            'query_for_ephemeris', 'query_result', 'create_ephemeris_from_query',
+            'seed_query_cache', 'clear_query_cache'
         ]
         return PluginUserApi(self, expose=expose)
 
@@ -227,19 +261,16 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
     def ephemeris(self):
         return self.ephemerides.get(self.component_selected, {})
 
-    def _times_to_phases_callable(self, component):
+    def _ephem_params(self, component):
         if component == self.component_selected:
             # retrieving from traitlets is cheaper than dictionaries
-            t0 = self.t0
-            period = self.period
-            dpdt = self.dpdt
-            wrap_at = self.wrap_at
-        else:
-            ephem = self.ephemerides.get(component, {})
-            t0 = ephem.get('t0', _default_t0)
-            period = ephem.get('period', _default_period)
-            dpdt = ephem.get('dpdt', _default_dpdt)
-            wrap_at = ephem.get('wrap_at', _default_wrap_at)
+            return self.t0, self.period, self.dpdt, self.wrap_at
+        ephem = self.ephemerides.get(component, {})
+        return (ephem.get('t0', _default_t0), ephem.get('period', _default_period),
+                ephem.get('dpdt', _default_dpdt), ephem.get('wrap_at', _default_wrap_at))
+
+    def _times_to_phases_callable(self, component):
+        t0, period, dpdt, wrap_at = self._ephem_params(component)
 
         def _callable(times):
             if hasattr(times, '__len__') and not len(times):
@@ -273,6 +304,19 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
         else:
             return t0 + (phases)*period
 
+    def _on_data_added(self, msg):
+        if getattr(self._app._jdaviz_helper, '_in_batch_load', 0):
+            # defer until exiting the (outermost) batch_load so that phases for all data added
+            # within the batch are computed together
+            self._phase_update_pending = True
+            return
+        self._update_all_phase_arrays()
+
+    def _on_exit_batch_load(self, msg):
+        if self._phase_update_pending:
+            self._phase_update_pending = False
+            self._update_all_phase_arrays()
+
     def _update_all_phase_arrays(self, *args, ephem_component=None):
         # `ephem_component` is the name given to the
         # *ephemeris* component in the orbiting system, e.g. "default",
@@ -289,9 +333,10 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
 
         # we'll create the callable function for this component once so it can be re-used
         _times_to_phases = self._times_to_phases_callable(ephem_component)
+        ephem_version = self._ephem_params(ephem_component)
 
-        new_links = []
-        for i, data in enumerate(dc):
+        updated_data = []
+        for data in dc:
             data_is_folded = '_LCVIZ_EPHEMERIS' in data.meta.keys()
             if data_is_folded:
                 continue
@@ -299,27 +344,20 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
                 # skip non-light curve data (e.g. images, cubes)
                 continue
 
-            times = data.get_component('World 0').data
-            phases = _times_to_phases(times)
-
-            self._app._jdaviz_helper._set_data_component(
-                data, _phase_comp_lbl, phases
-            )
-
-            if i != 0:
-                ref_data = dc[0]
-                new_link = LinkSame(
-                    cid1=ref_data.world_component_ids[0],
-                    cid2=data.world_component_ids[0],
-                    data1=ref_data,
-                    data2=data,
-                    labels1=ref_data.label,
-                    labels2=data.label
-                )
+            # the phases only need to be (re-)computed if the ephemeris or the times (i.e. the
+            # coordinates object) changed since the last update, or the component was removed
+            prev_ephem_version, prev_coords = self._phase_versions.get((data.uuid, ephem_component),
+                                                                       (None, None))
+            if (prev_ephem_version == ephem_version and prev_coords is data.coords
+                    and _phase_comp_lbl in [comp.label for comp in data.components]):
+                continue
+            self._phase_versions[(data.uuid, ephem_component)] = (ephem_version, data.coords)
 
-                new_links.append(new_link)
+            self._set_phase_component(data, _phase_comp_lbl, _times_to_phases)
+            updated_data.append(data)
 
-        dc.add_link(new_links)
+        # only adds links for data that are not already linked
+        _TimeLinkRegistry.for_app(self._app).link(updated_data)
 
         # update any plugin markers
         for viewer in self._get_phase_viewers(ephem_component):
@@ -329,6 +367,37 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
 
         return _phase_comp_lbl
 
+    def _set_phase_component(self, data, phase_comp_lbl, times_to_phases):
+        # the phases are only computed when first accessed (e.g. by a phase viewer or get_data)
+        # and then cached until the next update
+        def loader():
+            return times_to_phases(data.get_component('World 0').data)
+
+        # find or create the component ID following helper._set_data_component
+        helper = self._app._jdaviz_helper
+        if phase_comp_lbl in helper._component_ids:
+            cid = helper._component_ids[phase_comp_lbl]
+        else:
+            existing_components = [comp.label for comp in data.components]
+            if phase_comp_lbl in existing_components:
+                cid = data.components[existing_components.index(phase_comp_lbl)]
+            else:
+                cid = ComponentID(phase_comp_lbl)
+                helper._component_ids[phase_comp_lbl] = cid
+
+        if cid not in data.components:
+            data.add_component(LazyComponent(loader, data.shape, float), cid)
+        elif isinstance(data.get_component(cid), LazyComponent):
+            data.get_component(cid).reset(loader)
+            # equivalent to the notifications in data.update_components
+            for subset in data.subsets:
+                clear_cache(subset.subset_state.to_mask)
+            if data.hub is not None:
+                data.hub.broadcast(NumericalDataChangedMessage(data, components_changed=[cid]))
+        else:
+            # existing phase column (e.g. from loading a light curve exported with phases)
+            helper._set_data_component(data, phase_comp_lbl, loader())
+
     def _set_viewer_to_ephem_component(self, viewer, ephem_component=None):
         viewer._ephemeris_component = ephem_component
 
@@ -352,6 +421,7 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
         """
         if ephem_component is None:
             ephem_component = self.component_selected
+        self._ephem_update.flush()
         _phase_comp_lbl = self._phase_comp_lbl(ephem_component)
         dc = self._app.data_collection
 
@@ -422,6 +492,7 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
 
     def _on_component_rename(self, old_lbl, new_lbl):
         # this is triggered when the plugin component detects a change to the component name
+        self._ephem_update.flush()
         self._ephemerides[new_lbl] = self._ephemerides.pop(old_lbl, {})
         for viewer in self._get_phase_viewers(old_lbl):
             self._app._update_viewer_reference_name(
@@ -445,6 +516,7 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
                                                             sender=self))
 
     def _on_component_remove(self, lbl):
+        self._ephem_updates_pending.discard(lbl)
         _ = self._ephemerides.pop(lbl, {})
         # remove the corresponding viewer(s), if any exist
         for viewer in self._get_phase_viewers(lbl):
@@ -471,6 +543,7 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
         if self.component_selected == '':
             # no component selected (this can happen when removing all components)
             return
+        self._ephem_update.flush()
         self._check_if_phase_viewer_exists()
         ephem = self._ephemerides.get(self.component_selected, {})
 
@@ -518,18 +591,33 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
         if ephem_component not in self.component.choices:  # pragma: no cover
             raise ValueError(f"component must be one of {self.component.choices}")
 
+        existing_ephem = self._set_ephemeris_values(ephem_component, t0=t0, period=period,
+                                                    dpdt=dpdt, wrap_at=wrap_at)
+        self._ephem_updates_pending.discard(ephem_component)
+        self._apply_ephem_update(ephem_component)
+        return existing_ephem
+
+    def _set_ephemeris_values(self, ephem_component, **kwargs):
+        # update the stored values only, without updating phases
         existing_ephem = self._ephemerides.get(ephem_component, {})
-        for name, value in {'t0': t0, 'period': period, 'dpdt': dpdt, 'wrap_at': wrap_at}.items():
+        for name, value in kwargs.items():
             if value is not None:
                 existing_ephem[name] = value
                 if ephem_component == self.component_selected:
                     setattr(self, name, value)
-
         self._ephemerides[ephem_component] = existing_ephem
+        return existing_ephem
+
+    def _apply_ephem_update(self, ephem_component):
         self._update_all_phase_arrays(ephem_component=ephem_component)
         self.hub.broadcast(EphemerisChangedMessage(ephemeris_label=ephem_component,
                                                    sender=self))
-        return existing_ephem
+
+    def _apply_pending_ephem_updates(self):
+        pending, self._ephem_updates_pending = self._ephem_updates_pending, set()
+        for ephem_component in pending:
+            if ephem_component in self.component.choices:
+                self._apply_ephem_update(ephem_component)
 
     @observe('period', 'dpdt', 't0', 'wrap_at')
     def _ephem_traitlet_changed(self, event={}):
@@ -549,7 +637,15 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
             self.create_phase_viewer()
 
         # update value in the dictionary (to support multi-ephems)
-        if event:
+        if event and event.get('name') in self._property_lock:
+            # changed from the front-end (e.g. while dragging a slider): store the value now, but
+            # coalesce the phase updates (and resulting messages) of a burst of changes into a
+            # single update with the latest values, at most once per frame
+            self._set_ephemeris_values(self.component_selected,
+                                       **{event.get('name'): event.get('new')})
+            self._ephem_updates_pending.add(self.component_selected)
+            self._ephem_update()
+        elif event:
             self.update_ephemeris(**{event.get('name'): event.get('new')})
             # will call _update_all_phase_arrays
         else:
@@ -582,35 +678,53 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
     def _update_periodogram(self, *args):
         if not (hasattr(self, 'method') and hasattr(self, 'dataset')):
             return
-        if self.reference_time is None and self.dataset.selected_obj is not None:
-            self.reference_time = self.dataset.selected_obj.meta.get('REFTIME', 0.0)
+        lc = self.dataset.selected_obj
+        if self.reference_time is None and lc is not None:
+            self.reference_time = lc.meta.get('REFTIME', 0.0)
         # TODO: support multiselect on self.dataset and combine light curves (or would that be a
         # dedicated plugin of its own)?
-        self.method_spinner = True
+        if self.method_selected not in ('Box Least Squares', 'Lomb-Scargle'):  # pragma: no cover
+            raise NotImplementedError(f"periodogram not implemented for {self.method_selected}")
+
+        # the periodogram (BLS in particular) can take a while for long light curves, so is
+        # computed in the background.  Any previous request is superseded: cancelled if not yet
+        # started, otherwise its result is discarded.
+        if self._periodogram_future is not None:
+            self._periodogram_future.cancel()
+        self._periodogram_request += 1
         self.method_err = ''
-        if self.method == 'Box Least Squares':
-            try:
-                per = periodogram.BoxLeastSquaresPeriodogram.from_lightcurve(self.dataset.selected_obj)  # noqa
-            except Exception as err:
-                self.method_spinner = False
+        if lc is None:
+            self._periodogram_future = None
+            self.method_spinner = False
+            return
+        self.method_spinner = True
+        self._periodogram_future = _periodogram_executor.submit(
+            self._compute_period_at_max_power, lc, self.method_selected, self._periodogram_request
+        )
+
+    def _compute_period_at_max_power(self, lc, method, request):
+        try:
+            # shared with other plugins (e.g. Frequency Analysis)
+            per = _periodogram_cache.get(lc, method)
+        except Exception as err:
+            if request == self._periodogram_request:
                 self.method_err = str(err)
-                return
-        elif self.method == 'Lomb-Scargle':
-            try:
-                per = periodogram.LombScarglePeriodogram.from_lightcurve(self.dataset.selected_obj)
-            except Exception as err:
                 self.method_spinner = False
-                self.method_err = str(err)
-                return
-        else:  # pragma: no cover
-            self.method_spinner = False
-            raise NotImplementedError(f"periodogram not implemented for {self.method}")
-
+            return
+        if request != self._periodogram_request:
+            # superseded by a newer request while computing
+            return
         # TODO: will need to return in display units once supported
         self.period_at_max_power = per.period_at_max_power.value
         self.method_spinner = False
 
+    def _wait_for_periodogram(self):
+        # wait for the periodogram being computed in the background (if any)
+        if self._periodogram_future is not None:
+            concurrent.futures.wait([self._periodogram_future])
+
     def adopt_period_at_max_power(self):
+        self._wait_for_periodogram()
         self.period = self.period_at_max_power
 
     def vue_adopt_period_at_max_power(self, *args):
@@ -623,6 +737,7 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
         if ephem_component is None:
             ephem_component = self.component.selected
 
+        self._ephem_update.flush()
         lc = self._app._jdaviz_helper.get_data(dataset)
         data = next((x for x in self._app.data_collection if x.label == dataset))
 
@@ -664,18 +779,78 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
             return
         if self.dataset.selected_obj is None:
             return
-        self.query_name = self.dataset.selected_obj.meta.get('OBJECT', '')
+        self.query_name = self.dataset.selected_obj.meta.get('OBJECT') or ''
         self.query_ra = self.dataset.selected_obj.meta.get('RA')
         self.query_dec = self.dataset.selected_obj.meta.get('DEC')
 
+    @staticmethod
+    def _cached_query(key, query, local_query):
+        seed = _query_cache.get(_seed_key, ignore_ttl=True)
+        if seed is not None:
+            # the local copy of the table is used instead of querying the archive
+            return local_query(seed)
+        query_result = _query_cache.get(key)
+        if query_result is None:
+            query_result = query()
+            _query_cache.set(key, query_result)
+        # copy since the result is sorted and indexed in place
+        return query_result.copy()
+
+    def seed_query_cache(self, table):
+        """
+        Seed the query cache with a local copy of the NASA Exoplanet Archive's Planetary System
+        Composite Parameters table, after which all queries are answered from the local copy
+        without network access (until ``clear_query_cache`` is called).
+
+        Parameters
+        ----------
+        table : `~astropy.table.Table` or str
+            The table (with at least the pl_name, hostname, ra, dec, pl_orbper, and pl_tranmid
+            columns) or the filename of a local copy (in any format supported by
+            `~astropy.table.Table.read`, e.g. CSV or VOTable).
+        """
+        if isinstance(table, str):
+            table = Table.read(table)
+        seed = QTable()
+        for col, unit in (('pl_name', None), ('hostname', None), ('ra', u.deg), ('dec', u.deg),
+                          ('pl_orbper', u.day), ('pl_tranmid', u.day)):
+            values = table[col]
+            if unit is None:
+                seed[col] = np.asarray(values).astype(str)
+                continue
+            # missing values are stored as NaN
+            mask = np.broadcast_to(getattr(values, 'mask', False), len(values))
+            values = getattr(values, 'unmasked', values)
+            if getattr(values, 'unit', None) is not None:
+                values = u.Quantity(values).to_value(unit)
+            seed[col] = np.where(mask, np.nan, np.asarray(values, dtype=float)) * unit
+        _query_cache.set(_seed_key, seed)
+
+    def clear_query_cache(self):
+        """
+        Clear all cached NASA Exoplanet Archive query results, including any local copy of the
+        table set by ``seed_query_cache``.
+        """
+        _query_cache.clear()
+
     def query_for_ephemeris(self):
         query_result = None
 
         if self.query_name:
             # first query by object name:
-            query_result = self.nasa_exoplanet_archive.query_object(
-                object_name=self.query_name,
-                table='pscomppars'
+            name = self.query_name.strip()
+
+            def local_query(seed):
+                return seed[(np.char.lower(seed['hostname']) == name.lower()) |
+                            (np.char.lower(seed['pl_name']) == name.lower())]
+
+            query_result = self._cached_query(
+                ('object', name.lower()),
+                lambda: self.nasa_exoplanet_archive.query_object(
+                    object_name=name,
+                    table='pscomppars'
+                ),
+                local_query
             )
 
         if (
@@ -684,10 +859,21 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
         ):
             # next query by coordinates:
             coord = SkyCoord(ra=self.query_ra, dec=self.query_dec, unit=u.deg)
-            query_result = self.nasa_exoplanet_archive.query_region(
-                table='pscomppars',
-                coordinates=coord,
-                radius=self.query_radius * u.arcsec,
+            radius = self.query_radius * u.arcsec
+
+            def local_query(seed):
+                seed_coords = SkyCoord(ra=seed['ra'], dec=seed['dec'])
+                return seed[seed_coords.separation(coord) <= radius]
+
+            query_result = self._cached_query(
+                ('region', round(self.query_ra, _query_coord_decimals),
+                 round(self.query_dec, _query_coord_decimals), round(self.query_radius, 2)),
+                lambda: self.nasa_exoplanet_archive.query_region(
+                    table='pscomppars',
+                    coordinates=coord,
+                    radius=radius,
+                ),
+                local_query
             )
 
         if query_result is None or len(query_result) == 0:
@@ -706,25 +892,42 @@ class Ephemeris(PluginTemplateMixin, DatasetSelectMixin):
                 }
                 for name, period, epoch in zip(
                     list(self.astroquery_result['pl_name']),
-                    np.array(self.astroquery_result['pl_orbper'].to_value(u.day)),
-                    np.array(self.astroquery_result['pl_tranmid'].to_value(u.day))
+                    np.array(_to_days(self.astroquery_result['pl_orbper'])),
+                    np.array(_to_days(self.astroquery_result['pl_tranmid']))
                 )
             ]
 
     @observe('query_result_selected')
     def _select_query_result(self, *args):
         selected_query_result = self.astroquery_result.loc[self.query_result_selected]
-        self.period_from_catalog = selected_query_result['pl_orbper'].base.to_value(u.day)
-        if np.isnan(selected_query_result['pl_tranmid'].base.to_value(u.day)):
+        self.period_from_catalog = _to_days(selected_query_result['pl_orbper'])
+        if np.isnan(_to_days(selected_query_result['pl_tranmid'])):
             self.t0_from_catalog = 0
         else:
             self.t0_from_catalog = (
-                selected_query_result['pl_tranmid'].base.to_value(u.day) - self.reference_time
+                _to_days(selected_query_result['pl_tranmid']) - self.reference_time
             ) % self.period_from_catalog
 
-    @with_spinner('query_spinner')
     def vue_query_for_ephemeris(self, *args):
-        self.query_for_ephemeris()
+        if self.query_spinner:
+            # a query is already in progress
+            return
+
+        # query in a separate thread so that the UI remains responsive while waiting on
+        # the archive
+        def query():
+            try:
+                self.query_for_ephemeris()
+            except Exception as e:
+                self.hub.broadcast(SnackbarMessage(
+                    f"NASA Exoplanet Archive query failed: {e}",
+                    sender=self, color="error", traceback=e
+                ))
+            finally:
+                self.query_spinner = False
+
+        self.query_spinner = True
+        threading.Thread(target=query, daemon=True).start()
 
     def create_ephemeris_from_query(self, *args):
         new_component_label = self.query_result_selected.replace(' ', '')
@@ -2,22 +2,30 @@ import numpy as np
 from functools import cached_property
 from traitlets import Bool, Float, List, Unicode, observe
 
-from lightkurve import periodogram
+from astropy import units as u
+from astropy.table import QTable
+from astropy.timeseries import LombScargle
 
-from jdaviz.core.custom_traitlets import FloatHandleEmpty
+from jdaviz.core.custom_traitlets import FloatHandleEmpty, IntHandleEmpty
 from jdaviz.core.registries import tray_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin,
-                                        DatasetSelectMixin, SelectPluginComponent, PlotMixin)
+                                        DatasetMultiSelectMixin, SelectPluginComponent, PlotMixin,
+                                        AutoTextField, Table, with_spinner)
 from jdaviz.core.user_api import PluginUserApi
+from lightkurve import LightCurveCollection, periodogram
 
-from lcviz.utils import data_not_folded, is_lc
+from lcviz.components import FluxColumnSelectMixin
+from lcviz.utils import (data_not_folded, is_lc, _CoalescedCall, _data_with_reftime,
+                         _minmax_decimate, _parallel_map, _periodogram_cache, _prewhiten,
+                         _sinusoids_design_matrix, _top_peaks)
 
 
 __all__ = ['FrequencyAnalysis']
 
 
 @tray_registry('frequency-analysis', label="Frequency Analysis", category='data:analysis')
-class FrequencyAnalysis(PluginTemplateMixin, DatasetSelectMixin, PlotMixin):
+class FrequencyAnalysis(PluginTemplateMixin, FluxColumnSelectMixin, DatasetMultiSelectMixin,
+                        PlotMixin):
     """
     See the :ref:`Frequency Analysis Plugin Documentation <frequency_analysis>` for more details.
 
@@ -27,16 +35,32 @@ class FrequencyAnalysis(PluginTemplateMixin, DatasetSelectMixin, PlotMixin):
     * :meth:`~jdaviz.core.template_mixin.PluginTemplateMixin.show`
     * :meth:`~jdaviz.core.template_mixin.PluginTemplateMixin.open_in_tray`
     * :meth:`~jdaviz.core.template_mixin.PluginTemplateMixin.close_in_tray`
+    * ``multiselect``:
+      Whether to combine multiple datasets into a single periodogram.
     * ``dataset`` (:class:`~jdaviz.core.template_mixin.DatasetSelect`):
-      Dataset to use for analysis.
+      Dataset to use for analysis.  If ``multiselect`` is enabled, the selected light curves are
+      normalized and stitched together.
     * ``method`` (:class:`~jdaviz.core.template_mixin.SelectPluginComponent`):
-      Method/algorithm to determine the period.
+      Method/algorithm to determine the period.  'Lomb-Scargle (NUFFT)' computes the same
+      periodogram as 'Lomb-Scargle' with a non-uniform FFT, which is faster for long light curves
+      and fine frequency grids.
     * ``xunit`` (:class:`~jdaviz.core.template_mixin.SelectPluginComponent`):
       Whether to plot power vs fequency or period.
+    * ``grid`` (:class:`~jdaviz.core.template_mixin.SelectPluginComponent`):
+      Whether to evaluate the power on a uniform grid or from an adaptive (coarse-to-fine) search
+      around the highest peaks.
     * ``auto_range`` : bool
     * ``minimum`` : float
     * ``maximum`` : float
     * :meth:``periodogram``
+    * :meth:`batch_periodograms`
+    * ``prewhiten_n_frequencies`` : int
+      Number of frequencies to extract by :meth:`prewhiten`.
+    * ``prewhiten_flux_label`` (:class:`~jdaviz.core.template_mixin.AutoTextField`):
+      Label for the flux column of the residuals added to ``dataset`` by :meth:`prewhiten`.
+    * ``prewhiten_table`` (:class:`~jdaviz.core.template_mixin.Table`):
+      Frequencies extracted by the last call to :meth:`prewhiten`.
+    * :meth:`prewhiten`
     """
     template_file = __file__, "frequency_analysis.vue"
 
@@ -46,6 +70,9 @@ class FrequencyAnalysis(PluginTemplateMixin, DatasetSelectMixin, PlotMixin):
     xunit_items = List().tag(sync=True)
     xunit_selected = Unicode().tag(sync=True)
 
+    grid_items = List().tag(sync=True)
+    grid_selected = Unicode().tag(sync=True)
+
     auto_range = Bool(True).tag(sync=True)
     minimum = FloatHandleEmpty(0.1).tag(sync=True)  # frequency
     minimum_step = Float(0.1).tag(sync=True)
@@ -55,10 +82,27 @@ class FrequencyAnalysis(PluginTemplateMixin, DatasetSelectMixin, PlotMixin):
     spinner = Bool().tag(sync=True)
     err = Unicode().tag(sync=True)
 
+    prewhiten_n_frequencies = IntHandleEmpty(5).tag(sync=True)
+    prewhiten_flux_label_label = Unicode().tag(sync=True)
+    prewhiten_flux_label_default = Unicode().tag(sync=True)
+    prewhiten_flux_label_auto = Bool(True).tag(sync=True)
+    prewhiten_flux_label_invalid_msg = Unicode('').tag(sync=True)
+    prewhiten_flux_label_overwrite = Bool(False).tag(sync=True)
+    prewhiten_table_widget = Unicode().tag(sync=True)
+    prewhiten_spinner = Bool().tag(sync=True)
+    prewhiten_err = Unicode().tag(sync=True)
+
+    # resolution (approximate width of the plot in pixels) of the min/max envelope of the
+    # periodogram that is sent to the plot
+    _display_bins = 1000
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._plugin_description = 'Frequency/period analysis.'
         self._ignore_auto_update = False
+        # (periodogram, xunit, limits) currently displayed, to skip redundant updates
+        self._displayed = None
+        self._display_update = _CoalescedCall(self._update_periodogram_display)
 
         # do not support data only in phase-space
         self.dataset.add_filter(data_not_folded, is_lc)
@@ -66,18 +110,36 @@ class FrequencyAnalysis(PluginTemplateMixin, DatasetSelectMixin, PlotMixin):
         self.method = SelectPluginComponent(self,
                                             items='method_items',
                                             selected='method_selected',
-                                            manual_options=['Lomb-Scargle', 'Box Least Squares'])
+                                            manual_options=['Lomb-Scargle', 'Lomb-Scargle (NUFFT)',
+                                                            'Box Least Squares'])
+
+        self.grid = SelectPluginComponent(self,
+                                          items='grid_items',
+                                          selected='grid_selected',
+                                          manual_options=['uniform', 'adaptive'])
 
         self.xunit = SelectPluginComponent(self,
                                            items='xunit_items',
                                            selected='xunit_selected',
                                            manual_options=['frequency', 'period'])
 
+        self.prewhiten_flux_label = AutoTextField(self, 'prewhiten_flux_label_label',
+                                                  'prewhiten_flux_label_default',
+                                                  'prewhiten_flux_label_auto',
+                                                  'prewhiten_flux_label_invalid_msg')
+        self.prewhiten_table = Table(self, name='prewhiten_table')
+        self.prewhiten_table.show_if_empty = False
+        self.prewhiten_table_widget = 'IPY_MODEL_' + self.prewhiten_table.model_id
+        self._set_prewhiten_default_label()
+
         self.plot.figure.axes[1].label = 'power'
         self.plot.figure.fig_margin = {'top': 60, 'bottom': 60, 'left': 65, 'right': 15}
         self.plot.viewer.axis_y.num_ticks = 5
         self.plot.viewer.axis_y.tick_format = '0.2e'
         self.plot.viewer.axis_y.label_offset = '55px'
+        # the envelope is recomputed at full resolution within the new limits when zooming
+        for att in ('x_min', 'x_max'):
+            self.plot.viewer.state.add_callback(att, lambda *args: self._display_update())
         self._update_xunit()
 
         self._set_relevant()
@@ -91,55 +153,217 @@ class FrequencyAnalysis(PluginTemplateMixin, DatasetSelectMixin, PlotMixin):
 
     @property
     def user_api(self):
-        expose = ['dataset', 'method', 'xunit', 'auto_range', 'minimum', 'maximum', 'periodogram']
+        expose = ['multiselect', 'dataset', 'method', 'xunit', 'grid', 'auto_range',
+                  'minimum', 'maximum', 'periodogram', 'batch_periodograms',
+                  'prewhiten_n_frequencies', 'prewhiten_flux_label', 'prewhiten_table',
+                  'prewhiten']
         return PluginUserApi(self, expose=expose)
 
+    def _get_light_curves(self, labels):
+        # retrieving data is not thread-safe, so this should be done before any concurrent work
+        return [self._app._jdaviz_helper.get_data(data_label=label, cls=self.dataset.get_data_cls)
+                for label in labels]
+
+    @property
+    def _input_lc(self):
+        if not self.dataset.multiselect:
+            return self.dataset.selected_obj
+        if not len(self.dataset.selected):
+            raise ValueError("no datasets selected")
+        lcs = self._get_light_curves(self.dataset.selected)
+        if len(lcs) == 1:
+            return lcs[0]
+        # gaps between the light curves are left as-is (no resampling)
+        return LightCurveCollection(lcs).stitch()
+
     @cached_property
     def periodogram(self):
-        # TODO: support multiselect on self.dataset and combine light curves (or would that be a
-        # dedicated plugin of its own)?
         self.spinner = True
         self.err = ''
+        if self.method_selected not in _periodogram_cache.methods:
+            self.spinner = False
+            raise NotImplementedError(f"periodogram not implemented for {self.method}")
+        try:
+            # shared with other plugins (e.g. Ephemeris), so previously computed configurations
+            # are re-used
+            per = _periodogram_cache.get(self._input_lc, self.method_selected,
+                                         **self._periodogram_options())
+        except Exception as err:
+            self.spinner = False
+            self.err = str(err)
+            self.plot.update_style('periodogram', visible=False)
+            return None
+
+        self._update_periodogram_labels(per)
+        self.spinner = False
+        return per
+
+    def _periodogram_options(self):
         if self.auto_range:
             min_period, max_period = None, None
         elif self.xunit_selected == 'period':
             min_period, max_period = self.minimum, self.maximum
         else:
             min_period, max_period = self.maximum ** -1, self.minimum ** -1
-        if self.method == 'Box Least Squares':
-            try:
-                per = periodogram.BoxLeastSquaresPeriodogram.from_lightcurve(self.dataset.selected_obj,  # noqa
-                                                                             minimum_period=min_period,  # noqa
-                                                                             maximum_period=max_period)  # noqa
-            except Exception as err:
-                self.spinner = False
-                self.err = str(err)
-                self.plot.update_style('periodogram', visible=False)
-                return None
-        elif self.method == 'Lomb-Scargle':
-            try:
-                per = periodogram.LombScarglePeriodogram.from_lightcurve(self.dataset.selected_obj,
-                                                                         minimum_period=min_period,
-                                                                         maximum_period=max_period)
-            except Exception as err:
-                self.spinner = False
-                self.err = str(err)
-                self.plot.update_style('periodogram', visible=False)
-                return None
-        else:
-            self.spinner = False
+        return {'grid': self.grid_selected,
+                'minimum_period': min_period, 'maximum_period': max_period}
+
+    def batch_periodograms(self, datasets=None, top_k=3, max_workers=None):
+        """
+        Compute the periodograms of several datasets concurrently (with the current ``method``,
+        ``grid``, and range options) and tabulate their highest peaks.
+
+        Parameters
+        ----------
+        datasets : list of str, optional
+            Labels of the datasets.  Defaults to all light curves available in ``dataset``.
+        top_k : int, optional
+            Number of peaks (local maxima of the power) to report per dataset.
+        max_workers : int, optional
+            Maximum number of worker threads.  Defaults to the number of CPUs.
+
+        Returns
+        -------
+        peaks : `~astropy.table.QTable`
+            One row per peak (in the order of ``datasets`` and by decreasing power), with the
+            ``dataset`` label, ``rank`` (starting at 1), ``period``, ``frequency``, ``power`` (in
+            the units of the periodogram of each dataset), ``sde`` (signal detection efficiency:
+            the power in units of standard deviations above the mean power of the periodogram),
+            and ``false_alarm_probability`` (Baluev approximation, for Lomb-Scargle only).
+        """
+        if self.method_selected not in _periodogram_cache.methods:
             raise NotImplementedError(f"periodogram not implemented for {self.method}")
+        if datasets is None:
+            datasets = self.dataset.choices
+        elif isinstance(datasets, str):
+            datasets = [datasets]
+        for label in datasets:
+            if label not in self.dataset.choices:
+                raise ValueError(f"{label} is not a valid dataset, must be one of "
+                                 f"{self.dataset.choices}")
 
-        self._update_periodogram_labels(per)
-        self.spinner = False
-        return per
+        method, options = self.method_selected, self._periodogram_options()
+        lcs = self._get_light_curves(datasets)
+
+        def peaks(lc):
+            per = _periodogram_cache.get(lc, method, **options)
+            return _periodogram_peaks(lc, per, top_k)
+
+        rows = []
+        for label, dataset_peaks in zip(datasets,
+                                        _parallel_map(peaks, lcs, max_workers=max_workers)):
+            rows += [(label, rank + 1) + row for rank, row in enumerate(dataset_peaks)]
+        names = ('dataset', 'rank', 'period', 'frequency', 'power', 'sde',
+                 'false_alarm_probability')
+        if not len(rows):
+            return QTable(names=names, dtype=(str, int, float, float, float, float, float))
+        table = QTable(rows=rows, names=names)
+        table['period'].unit = u.d
+        table['frequency'].unit = 1 / u.d
+        return table
+
+    @observe('dataset_selected', 'flux_column_selected')
+    def _set_prewhiten_default_label(self, event={}):
+        if not hasattr(self, 'prewhiten_flux_label'):  # pragma: no cover
+            return
+        self.prewhiten_flux_label.default = f"{self.flux_column_selected or 'flux'}_prewhitened"
+
+    @observe('prewhiten_flux_label_label', 'dataset_selected', 'flux_column_items')
+    def _update_prewhiten_label_valid(self, event={}):
+        if not hasattr(self, 'prewhiten_flux_label'):  # pragma: no cover
+            return
+        if self.prewhiten_flux_label.value in self.flux_column.choices:
+            self.prewhiten_flux_label.invalid_msg = ''
+            self.prewhiten_flux_label_overwrite = True
+        elif (not self.dataset.multiselect and
+                self.prewhiten_flux_label.value in getattr(self.dataset.selected_obj,
+                                                           'columns', [])):
+            self.prewhiten_flux_label.invalid_msg = 'name already in use'
+        else:
+            self.prewhiten_flux_label.invalid_msg = ''
+            self.prewhiten_flux_label_overwrite = False
+
+    @with_spinner('prewhiten_spinner')
+    def prewhiten(self, n_frequencies=None, add_data=False):
+        """
+        Extract frequencies from the input light curve by prewhitening: iteratively take the
+        highest peak of the Lomb-Scargle periodogram of the residuals (within the current range
+        options, regardless of ``method`` and ``grid``), jointly refit all extracted sinusoids,
+        and subtract them.
+
+        The fitted model is ``offset + sum(amplitude * sin(2 pi frequency t + phase))``, with ``t``
+        the time (in days) of the light curve.  The results are also shown in
+        ``prewhiten_table``.
+
+        Parameters
+        ----------
+        n_frequencies : int, optional
+            Number of frequencies to extract.  Defaults to ``prewhiten_n_frequencies``.
+        add_data : bool
+            Whether to add the residuals as a new flux column (``prewhiten_flux_label``) in the
+            ``dataset`` entry.  Not supported when combining multiple datasets.
+
+        Returns
+        -------
+        frequencies : `~astropy.table.QTable`
+            One row per extracted frequency (in the order of extraction), with the ``frequency``,
+            ``period``, ``amplitude`` and ``phase`` of the joint fit and the ``power`` of the
+            periodogram of the residuals at the peak when it was extracted.
+        residual_lc : `~lightkurve.LightCurve`
+            The input light curve with the fitted model subtracted.
+        """
+        if n_frequencies is None:
+            n_frequencies = self.prewhiten_n_frequencies
+        if add_data and self.dataset.multiselect:
+            raise ValueError("cannot add residuals to data when combining multiple datasets")
+        input_lc = self._input_lc
+        if input_lc is None:  # pragma: no cover
+            raise ValueError("no input dataset selected")
+
+        options = self._periodogram_options()
+        options.pop('grid')
+        frequencies, coeffs, peak_power = _prewhiten(input_lc, int(n_frequencies), **options)
+
+        # the model is evaluated for all cadences (including any excluded by NaNs)
+        model = _sinusoids_design_matrix(input_lc.time.value, frequencies) @ coeffs
+        residual_lc = input_lc.copy()
+        residual_lc.flux = input_lc.flux - model * input_lc.flux.unit
+
+        amplitude = np.hypot(coeffs[1::2], coeffs[2::2])
+        table = QTable({'frequency': frequencies / u.d,
+                        'period': u.d / frequencies,
+                        'amplitude': amplitude * input_lc.flux.unit,
+                        'phase': np.arctan2(coeffs[1::2], coeffs[2::2]) * u.rad,
+                        'power': peak_power * input_lc.flux.unit})
+
+        self.prewhiten_table._clear_table()
+        for row in table:
+            self.prewhiten_table.add_item(row)
+
+        if add_data:
+            # add the residuals as a new flux column (without changing the selected column)
+            data = _data_with_reftime(self.app, residual_lc)
+            self.flux_column.add_new_flux_column(flux=data['flux'],
+                                                 flux_err=data['flux_err'],
+                                                 label=self.prewhiten_flux_label.value,
+                                                 selected=False)
+
+        return table, residual_lc
+
+    def vue_prewhiten(self, *args, **kwargs):
+        try:
+            self.prewhiten(add_data=True)
+        except Exception as e:
+            self.prewhiten_err = str(e)
+        else:
+            self.prewhiten_err = ''
 
     @observe('xunit_selected')
     def _update_xunit(self, *args):
         per = self.periodogram
         if per is not None:
             x = getattr(per, self.xunit_selected).value
-            self.plot._update_data('periodogram', x=x)
+            self._update_periodogram_display(per, full_range=True)
             self.plot.update_style('periodogram', visible=True)
             old_xmin, old_xmax = self.plot.viewer.state.x_min, self.plot.viewer.state.x_max
             new_xmin = old_xmax ** -1 if old_xmax > 0 else np.nanmin(x)
@@ -166,21 +390,22 @@ class FrequencyAnalysis(PluginTemplateMixin, DatasetSelectMixin, PlotMixin):
             self.plot.figure.axes[0].label = self.xunit_selected
             self.plot.figure.axes[1].label = "power"
 
-    @observe('dataset_selected', 'method_selected', 'auto_range', 'minimum', 'maximum')
-    def _update_periodogram(self, *args):
-        if not (hasattr(self, 'method') and hasattr(self, 'dataset')):
+    @observe('dataset_selected', 'flux_column_selected', 'method_selected', 'grid_selected',
+             'auto_range', 'minimum', 'maximum', 'multiselect')
+    def _update_periodogram(self, event={}):
+        if not (hasattr(self, 'method') and hasattr(self, 'dataset') and hasattr(self, 'grid')):
             return
         if self._ignore_auto_update:
             return
+        if self.auto_range and event.get('name') in ('minimum', 'maximum'):
+            # the range is not used when auto_range is enabled
+            return
 
-        # TODO: avoid clearing cache if change was to min/max but auto_range is True?
         self._clear_cache('periodogram')
 
         per = self.periodogram
         if per is not None:
-            self.plot._update_data('periodogram',
-                                   x=getattr(per, self.xunit_selected),
-                                   y=per.power.value)
+            self._update_periodogram_display(per)
             self.plot.update_style(
                 'periodogram',
                 density_map=False,
@@ -190,3 +415,58 @@ class FrequencyAnalysis(PluginTemplateMixin, DatasetSelectMixin, PlotMixin):
             self._update_periodogram_labels(per)
         else:
             self.plot.update_style('periodogram', visible=False)
+
+    def _update_periodogram_display(self, per=None, full_range=False):
+        """
+        Send a min/max envelope of the periodogram to the plot, at a resolution of
+        ``_display_bins`` across the full range and across the current limits of the plot (unless
+        ``full_range``), so that no peaks are lost when zoomed in or out.  The full resolution
+        periodogram remains available from ``periodogram``.
+        """
+        per = per if per is not None else self.periodogram
+        if per is None:
+            return
+        x = getattr(per, self.xunit_selected).value
+        y = per.power.value
+        x_min, x_max = self.plot.viewer.state.x_min, self.plot.viewer.state.x_max
+        if full_range or x_min is None or x_max is None:
+            x_min, x_max = np.nanmin(x), np.nanmax(x)
+        displayed = (self.xunit_selected, x_min, x_max)
+        if self._displayed is not None and self._displayed[0] is per \
+                and self._displayed[1:] == displayed:
+            return
+
+        n_bins = self._display_bins
+        inds = np.union1d(_minmax_decimate(x, y, n_bins),
+                          _minmax_decimate(x, y, n_bins, x_min, x_max))
+        if len(inds) < len(x):
+            # pad (with repeated points) to a fixed length so that the plotted data are updated in
+            # place rather than replaced when zooming
+            inds = np.pad(inds, (0, 4 * n_bins + 8 - len(inds)), mode='edge')
+        self._displayed = (per,) + displayed
+        self.plot._update_data('periodogram', x=x[inds], y=y[inds])
+
+
+def _periodogram_peaks(lc, per, top_k):
+    """
+    ``(period, frequency, power, sde, false_alarm_probability)`` of the ``top_k`` highest peaks
+    of the periodogram ``per`` of ``lc``, sorted by decreasing power.
+    """
+    power = per.power.value
+    inds = _top_peaks(power, top_k)
+    sde = (power[inds] - np.nanmean(power)) / np.nanstd(power)
+    frequency = per.frequency.to_value(1 / u.d)[inds]
+    if isinstance(per, periodogram.LombScarglePeriodogram) and len(inds):
+        # Baluev (2008) approximation, which requires the standard normalization of the power
+        # (rather than lightkurve's amplitude), evaluated only at the peaks
+        lc = lc.remove_nans()
+        dy = lc.flux_err if np.isfinite(lc.flux_err).all() else None
+        ls = LombScargle(lc.time, lc.flux, dy)
+        fap = ls.false_alarm_probability(
+            ls.power(frequency / u.d, method='cython'),
+            minimum_frequency=np.nanmin(per.frequency),
+            maximum_frequency=np.nanmax(per.frequency))
+        fap = np.asarray(fap, dtype=float)
+    else:
+        fap = np.full(len(inds), np.nan)
+    return list(zip(1 / frequency, frequency, power[inds], sde, fap))
@@ -1,4 +1,5 @@
 import pytest
+from glue.core import DataCollection
 import numpy as np
 from glue.core.roi import XRangeROI, YRangeROI
 from astropy.time import Time
@@ -223,3 +224,195 @@ def test_deconfigged_load_lc_visibility(light_curve_like_kepler_quarter):
     tools = viewer.toolbar.tools_data
     assert tools.get('jdaviz:selectslice', {}).get('visible'), \
         "selectslice tool should be visible after loading LC data"
+
+
+def test_lazy_fits_columns(light_curve_like_kepler_quarter, tmp_path):
+    from astropy.io import fits
+    from lcviz.utils import LazyComponent
+    from lcviz.loaders.importers.lightcurve.lightcurve import hdulist_to_lightcurve
+
+    # write a file with extra columns beyond those needed by lcviz
+    fits_path = tmp_path / "test_lc.fits"
+    lc = light_curve_like_kepler_quarter
+    sap_flux = lc.flux.value * 2
+    lc.to_fits(fits_path, overwrite=True, sap_flux=sap_flux)
+
+    with fits.open(fits_path, memmap=True) as hdulist:
+        parsed_lc = hdulist_to_lightcurve(hdulist[0].header, hdulist[1])
+        assert 'SAP_FLUX' not in parsed_lc.colnames
+        lazy_comp = parsed_lc._lcviz_lazy_components['SAP_FLUX']
+        assert isinstance(lazy_comp, LazyComponent)
+
+        dc = DataCollection()
+        dc['lc'] = parsed_lc
+        data = dc['lc']
+        assert data.get_component('SAP_FLUX') is lazy_comp
+        assert not lazy_comp.loaded
+        assert lazy_comp.numeric
+
+        np.testing.assert_allclose(data['SAP_FLUX'], sap_flux)
+        assert lazy_comp.loaded
+
+        # deferred columns are included when translating back to a light curve
+        np.testing.assert_allclose(data.get_object()['SAP_FLUX'], sap_flux)
+
+
+def test_lazy_fits_columns_dtypes(tmp_path):
+    from astropy.io import fits
+    from glue.core.component import CategoricalComponent
+    from lcviz.utils import LazyComponent
+    from lcviz.loaders.importers.lightcurve.lightcurve import hdulist_to_lightcurve
+
+    n = 5
+    fits_path = tmp_path / "test_lc.fits"
+    fits.BinTableHDU.from_columns([
+        fits.Column('TIME', 'D', array=np.arange(n, dtype=float)),
+        fits.Column('FLUX', 'E', array=np.ones(n)),
+        fits.Column('UINT', 'I', bzero=32768, array=np.arange(n, dtype='uint16') + 40000),
+        fits.Column('FLAG', 'L', array=np.arange(n) % 2 == 0),
+        fits.Column('LABEL', '5A', array=['a', 'bb', 'c', 'd', 'e']),
+    ]).writeto(fits_path)
+
+    with fits.open(fits_path, memmap=True) as hdulist:
+        lc = hdulist_to_lightcurve(hdulist[0].header, hdulist[1])
+        # only numeric columns are deferred, with the dtype after scaling
+        assert list(lc._lcviz_lazy_components) == ['UINT']
+        assert lc._lcviz_lazy_components['UINT']._dtype == np.uint16
+
+        dc = DataCollection()
+        dc['lc'] = lc
+        data = dc['lc']
+        assert isinstance(data.get_component('UINT'), LazyComponent)
+        np.testing.assert_array_equal(data['UINT'], np.arange(n) + 40000)
+        assert isinstance(data.get_component('LABEL'), CategoricalComponent)
+        assert list(data['LABEL']) == ['a', 'bb', 'c', 'd', 'e']
+        np.testing.assert_array_equal(data['FLAG'], np.arange(n) % 2 == 0)
+
+
+def test_dvt_lazy_fits_columns(dvt_like_hdulist):
+    from lcviz.loaders.importers.lightcurve.lightcurve import hdulist_to_lightcurve
+
+    lc = hdulist_to_lightcurve(dvt_like_hdulist[0].header, dvt_like_hdulist[1])
+    assert len(lc) == 499
+    np.testing.assert_allclose(lc.time.value[0], dvt_like_hdulist[1].data['TIME'][1] + 2457000)
+    assert list(lc._lcviz_lazy_components) == ['MODEL_INIT']
+
+    dc = DataCollection()
+    dc['lc'] = lc
+    # the NaN-flux rows are also removed from the deferred columns
+    assert dc['lc']['MODEL_INIT'].shape == (499,)
+
+
+@pytest.mark.parametrize('helper_name', ['helper', 'deconfigged_helper'])
+def test_load_dvt_hdulist(helper_name, dvt_like_hdulist, request):
+    helper = request.getfixturevalue(helper_name)
+    helper.load(dvt_like_hdulist, format='Light Curve', data_label='dvt')
+
+    labels = [data.label for data in helper._app.data_collection]
+    assert labels == ['dvt [TCE_1]', 'dvt [TCE_2]']
+    for data in helper._app.data_collection:
+        assert data.shape == (499,)
+        assert 'MODEL_INIT' in [comp.label for comp in data.components]
+
+    # the TPERIOD/TEPOCH header keys create one ephemeris per TCE
+    ephem = helper.plugins['Ephemeris']
+    assert 'TCE_1' in ephem.component.choices
+    assert 'TCE_2' in ephem.component.choices
+    np.testing.assert_allclose(ephem.ephemerides['TCE_2']['period'], 5.7)
+
+
+def test_dvt_parse_extensions_concurrently(dvt_like_hdulist):
+    from lcviz.loaders.importers.lightcurve.lightcurve import (
+        hdulist_to_lightcurve, hdulist_to_lightcurves
+    )
+
+    pri_header, hdus = dvt_like_hdulist[0].header, dvt_like_hdulist[1:]
+    lcs = hdulist_to_lightcurves(pri_header, hdus, max_workers=2)
+    assert [lc.meta['EXTNAME'] for lc in lcs] == ['TCE_1', 'TCE_2']
+    for lc, hdu in zip(lcs, hdus):
+        expected = hdulist_to_lightcurve(pri_header, hdu)
+        np.testing.assert_array_equal(lc.time.value, expected.time.value)
+        np.testing.assert_array_equal(lc.flux.value, expected.flux.value)
+
+
+def test_dvt_extension_selection_header_only(helper, dvt_like_hdulist):
+    ldr = helper.loaders['object']
+    ldr.object = dvt_like_hdulist
+    ldr.format = 'Light Curve'
+    importer = ldr.importer._obj
+    assert importer.create_ephemeris_available
+
+    importer.extension.selected = ['1: [TCE_1,1]']
+    importer.extension.selected = ['1: [TCE_1,1]', '2: [TCE_2,1]']
+    assert importer.create_ephemeris_available
+    # light curves are only parsed once importing
+    assert 'output' not in importer.__dict__
+
+    ldr.load()
+    assert len(helper._app.data_collection) == 2
+
+
+def test_lightkurve_parser_reads_once(helper, light_curve_like_kepler_quarter,
+                                      tmp_path, monkeypatch):
+    from lcviz.loaders.parsers import lightkurve as lk_parser
+
+    fits_path = tmp_path / "test_lc.fits"
+    light_curve_like_kepler_quarter.to_fits(fits_path, overwrite=True)
+    text_path = tmp_path / "not_a_lc.txt"
+    text_path.write_text("not a light curve")
+
+    n_reads = []
+    lkread = lk_parser.lkread
+
+    def counting_lkread(*args, **kwargs):
+        n_reads.append(args)
+        return lkread(*args, **kwargs)
+
+    monkeypatch.setattr(lk_parser, 'lkread', counting_lkread)
+
+    # validity is determined from the headers alone
+    assert not lk_parser.LightkurveParser(helper._app, str(text_path)).is_valid
+    assert lk_parser.LightkurveParser(helper._app, str(fits_path)).is_valid
+    assert len(n_reads) == 0
+
+    # the full read happens once per load
+    helper.load(str(fits_path), format='Light Curve')
+    assert len(n_reads) == 1
+
+
+def test_lkread_filetypes_match_lightkurve():
+    import inspect
+    import re
+    import lightkurve
+    from lightkurve.io.read import read
+    from lcviz.loaders.parsers import lightkurve as lk_parser
+
+    # file types handled explicitly by lightkurve.read, other detected file types are read by
+    # the lightkurve class of the same name (if one exists)
+    dispatched = set(re.findall(r'filetype == "(\w+)"', inspect.getsource(read)))
+    assert len(dispatched)
+    assert set(lk_parser._lkread_filetypes) == {filetype for filetype in dispatched
+                                                if not hasattr(lightkurve, filetype)}
+
+
+def test_load_many(helper, light_curve_like_kepler_quarter, tmp_path):
+    lc = light_curve_like_kepler_quarter
+    lc.meta['OBJECT'] = 'test'
+    fits_paths = []
+    for i in range(3):
+        fits_path = tmp_path / f"test_lc_{i}.fits"
+        lc.to_fits(fits_path, overwrite=True)
+        fits_paths.append(str(fits_path))
+
+    data_labels = [f'sector {i}' for i in range(4)]
+    helper.load_many(fits_paths + [lc], data_labels=data_labels, max_workers=2)
+
+    dc_labels = [data.label for data in helper._app.data_collection]
+    assert len(dc_labels) == len(data_labels)
+    for dc_label, data_label in zip(dc_labels, data_labels):
+        assert dc_label.startswith(data_label)
+    for data in helper._app.data_collection:
+        assert 'phase:default' in [comp.label for comp in data.components]
+
+    with pytest.raises(ValueError, match="same length"):
+        helper.load_many(fits_paths, data_labels=['a'])
@@ -1,6 +1,11 @@
+import numpy as np
 import pytest
 
+from numpy.testing import assert_allclose
+
 from lcviz.marks import LivePreviewBinning
+from lcviz.plugins.binning.binning import Binning
+from lcviz.utils import _bin_light_curve, _BinPrefixSums
 
 
 def _get_marks_from_viewer(viewer, cls=(LivePreviewBinning)):
@@ -74,3 +79,128 @@ def test_plugin_binning(helper_name, light_curve_like_kepler_quarter, request):
         # assert b._obj.bin_enabled is True
         # b.n_bins = ''
         # assert b._obj.bin_enabled is False
+
+
+def test_bin_light_curve(light_curve_like_kepler_quarter):
+    lc = light_curve_like_kepler_quarter.copy()
+    lc.flux_err = lc.flux_err * np.linspace(1, 2, len(lc))
+    lc.flux[::7] = np.nan
+    n_bins = 30
+    expected = lc.bin(time_bin_size=(lc.time[-1] - lc.time[0]).value / n_bins)
+
+    binned = _bin_light_curve(lc, n_bins)
+    assert_allclose(binned.time.value, expected.time.value)
+    assert_allclose(binned.flux.value, expected.flux.value)
+
+    # compare against a direct computation in each bin
+    x = lc.time.value
+    inds = np.minimum(((x - x[0]) / ((x[-1] - x[0]) / n_bins)).astype(int), n_bins - 1)
+    valid = np.isfinite(lc.flux.value)
+    flux, flux_err = lc.flux.value, lc.flux_err.value
+    for i in (0, n_bins // 2, n_bins - 1):
+        in_bin = (inds == i) & valid
+        n = in_bin.sum()
+        assert_allclose(binned.flux_err.value[i], np.sqrt(np.sum(flux_err[in_bin] ** 2)) / n)
+
+    weighted = _bin_light_curve(lc, n_bins, statistic='weighted mean')
+    median = _bin_light_curve(lc, n_bins, statistic='median')
+    for i in (0, n_bins // 2, n_bins - 1):
+        in_bin = (inds == i) & valid
+        weights = flux_err[in_bin] ** -2
+        assert_allclose(weighted.flux.value[i], np.average(flux[in_bin], weights=weights))
+        assert_allclose(weighted.flux_err.value[i], np.sum(weights) ** -0.5)
+        assert median.flux.value[i] == np.median(flux[in_bin])
+        assert_allclose(median.flux_err.value[i],
+                        np.sqrt(np.pi / 2) * binned.flux_err.value[i])
+
+    # without uncertainties, the standard error of the mean
+    lc.flux_err[:] = np.nan
+    binned = _bin_light_curve(lc, n_bins)
+    in_bin = (inds == 0) & valid
+    assert_allclose(binned.flux_err.value[0],
+                    np.std(flux[in_bin], ddof=1) / np.sqrt(in_bin.sum()))
+    with pytest.raises(ValueError, match='requires flux uncertainties'):
+        _bin_light_curve(lc, n_bins, statistic='weighted mean')
+    with pytest.raises(ValueError, match='statistic must be one of'):
+        _bin_light_curve(lc, n_bins, statistic='mode')
+
+
+def test_plugin_binning_statistic(helper, light_curve_like_kepler_quarter):
+    helper.load(light_curve_like_kepler_quarter, format='Light Curve')
+    b = helper.plugins['Binning']
+    b.n_bins = 50
+    assert b.statistic == 'mean'
+    binned = b.bin(add_data=False)
+    assert len(binned) == 50
+
+    b.statistic = 'median'
+    median = b.bin(add_data=False)
+    assert_allclose(median.time.value, binned.time.value)
+    assert not np.allclose(median.flux.value, binned.flux.value)
+
+    helper.plugins['Ephemeris'].period = 1.2345
+    b.ephemeris = 'default'
+    b.statistic = 'weighted mean'
+    phase_binned = b.bin(add_data=True)
+    assert len(phase_binned) == 50
+    assert np.all(np.isfinite(phase_binned.flux.value))
+
+
+@pytest.mark.parametrize('statistic', ['mean', 'weighted mean', 'median'])
+def test_bin_prefix_sums(light_curve_like_kepler_quarter, statistic):
+    lc = light_curve_like_kepler_quarter.copy()
+    lc.flux[::7] = np.nan
+    lc.flux_err[::5] = np.nan
+    bin_index = _BinPrefixSums(lc)
+    for n_bins in (1, 30, 1000):
+        binned = bin_index.bin(n_bins, statistic)
+        expected = _bin_light_curve(lc, n_bins, statistic)
+        assert_allclose(binned.time.value, expected.time.value)
+        assert_allclose(binned.flux.value, expected.flux.value, rtol=1e-12)
+        assert_allclose(binned.flux_err.value, expected.flux_err.value, rtol=1e-8)
+
+
+def test_plugin_binning_cache(helper, light_curve_like_kepler_quarter, monkeypatch):
+    n_read = []
+    input_lc = Binning.input_lc
+
+    def counting_input_lc(self):
+        n_read.append(self.ephemeris_selected)
+        return input_lc.fget(self)
+
+    monkeypatch.setattr(Binning, 'input_lc', property(counting_input_lc))
+
+    helper.load(light_curve_like_kepler_quarter, format='Light Curve')
+    b = helper.plugins['Binning']
+    b.n_bins = 10
+    b.bin(add_data=False)
+    assert len(n_read) == 1
+
+    # changing n_bins or the statistic re-uses the sorted input and its cumulative sums
+    for n_bins in (20, 50, 100):
+        b.n_bins = n_bins
+        binned = b.bin(add_data=False)
+        assert len(binned) == n_bins
+    b.statistic = 'weighted mean'
+    b.bin(add_data=False)
+    assert len(n_read) == 1
+    assert_allclose(binned.flux.value,
+                    _bin_light_curve(light_curve_like_kepler_quarter, 100).flux.value)
+
+    # the input is read again when the flux column or ephemeris changes
+    helper.plugins['Flux Column'].flux_column = 'flux_alt'
+    binned = b.bin(add_data=False)
+    assert len(n_read) == 2
+    assert np.nanmean(binned.flux.value) > 1.5
+
+    ephem = helper.plugins['Ephemeris']
+    ephem.period = 1.2345
+    b.ephemeris = 'default'
+    b.bin(add_data=False)
+    assert len(n_read) == 3
+    ephem.period = 1.5
+    b.bin(add_data=False)
+    assert len(n_read) == 4
+    b.n_bins = 30
+    b.bin(add_data=False)
+    assert len(n_read) == 4
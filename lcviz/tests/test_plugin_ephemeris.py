@@ -1,6 +1,15 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
 import pytest
+from glue.core.link_helpers import LinkSame
 from lightkurve import search_targetpixelfile
 
+from lcviz import utils
+from lcviz.utils import _periodogram_cache
+
 
 @pytest.mark.parametrize('helper_name', ['helper', 'deconfigged_helper'])
 def test_docs_snippets(helper_name, light_curve_like_kepler_quarter, request):
@@ -174,6 +183,14 @@ def test_ephemeris_adopt_period_with_tpf(helper_name, request):
     assert len(ephem._obj._get_phase_viewers()) == 2
 
 
+def test_ephemeris_query_params_without_object(helper, light_curve_like_kepler_quarter):
+    # data without an OBJECT header keyword (or with it set to None) leaves the query name empty
+    light_curve_like_kepler_quarter.meta['OBJECT'] = None
+    helper.load(light_curve_like_kepler_quarter, format='Light Curve')
+    ephem = helper.plugins['Ephemeris']
+    assert ephem._obj.query_name == ''
+
+
 @pytest.mark.parametrize('helper_name', ['helper', 'deconfigged_helper'])
 def test_ephemeris_queries(helper_name, light_curve_like_kepler_quarter, request):
     helper = request.getfixturevalue(helper_name)
@@ -203,3 +220,256 @@ def test_ephemeris_query_no_name(helper_name, light_curve_like_kepler_quarter, r
 
     ephem.query_result = planet
     ephem.create_ephemeris_from_query()
+
+
+def test_ephemeris_query_cache(helper, light_curve_like_kepler_quarter, tmp_path, monkeypatch):
+    from astropy import units as u
+    from astropy.table import QTable, Table
+    from lcviz.plugins.ephemeris import ephemeris as ephem_module
+    from lcviz.utils import _DiskCache
+
+    class FakeArchive:
+        # local stand-in for NasaExoplanetArchive, counting the queries sent to the archive
+        n_queries = {'object': 0, 'region': 0}
+
+        def _result(self):
+            return QTable({'pl_name': ['HAT-P-11 c', 'HAT-P-11 b'],
+                           'pl_orbper': [3407., 4.88780258] * u.day,
+                           'pl_tranmid': [np.nan, 2454957.8132067] * u.day})
+
+        def query_object(self, object_name, table):
+            self.n_queries['object'] += 1
+            return self._result() if object_name == 'HAT-P-11' else self._result()[:0]
+
+        def query_region(self, table, coordinates, radius):
+            self.n_queries['region'] += 1
+            return self._result()
+
+    monkeypatch.setattr(ephem_module, '_query_cache',
+                        _DiskCache('exoplanet_archive_queries', ttl=60, cache_dir=tmp_path))
+
+    helper.load(light_curve_like_kepler_quarter, format='Light Curve')
+    ephem = helper.plugins['Ephemeris']
+    archive = FakeArchive()
+    ephem._obj._nasa_exoplanet_archive = archive
+
+    ephem.query_for_ephemeris()
+    assert ephem.query_result.choices == ['HAT-P-11 b', 'HAT-P-11 c']
+    ephem.query_for_ephemeris()
+    assert archive.n_queries == {'object': 1, 'region': 0}
+
+    # cached entries persist on disk for a new session
+    monkeypatch.setattr(ephem_module, '_query_cache',
+                        _DiskCache('exoplanet_archive_queries', ttl=60, cache_dir=tmp_path))
+    ephem.query_for_ephemeris()
+    assert archive.n_queries == {'object': 1, 'region': 0}
+
+    # falls back on the (rounded) coordinates
+    ephem.query_name = 'unknown'
+    ephem.query_for_ephemeris()
+    ephem.query_ra = ephem.query_ra + 1e-6
+    ephem.query_for_ephemeris()
+    assert archive.n_queries == {'object': 2, 'region': 1}
+
+    # a local copy of the table answers queries without the archive
+    ephem.clear_query_cache()
+    dump = tmp_path / 'pscomppars.csv'
+    Table({'pl_name': ['HAT-P-11 b', 'Kepler-10 b'], 'hostname': ['HAT-P-11', 'Kepler-10'],
+           'ra': [297.7101763, 285.6794], 'dec': [48.0818635, 50.2413],
+           'pl_orbper': [4.88780258, 0.8374907], 'pl_tranmid': [2454957.8132067, np.nan]
+           }).write(dump)
+    ephem.seed_query_cache(str(dump))
+    ephem.query_name = 'hat-p-11'
+    ephem.query_for_ephemeris()
+    assert ephem.query_result.choices == ['HAT-P-11 b']
+    ephem.query_name = 'unknown'
+    ephem.query_for_ephemeris()
+    assert ephem.query_result.choices == ['HAT-P-11 b']
+    assert archive.n_queries == {'object': 2, 'region': 1}
+
+    ephem.query_result = 'HAT-P-11 b'
+    assert ephem._obj.period_from_catalog == 4.88780258
+    ephem.create_ephemeris_from_query()
+    assert ephem.period == 4.88780258
+
+    # queries from the UI run in a separate thread
+    ephem.query_name = 'Kepler-10'
+    ephem._obj.vue_query_for_ephemeris()
+    for _ in range(100):
+        if not ephem._obj.query_spinner:
+            break
+        time.sleep(0.05)
+    assert ephem.query_result.choices == ['Kepler-10 b']
+
+
+def test_incremental_phase_updates(helper, light_curve_like_kepler_quarter, monkeypatch):
+    n_ephems, n_data = 3, 4
+    helper.load(light_curve_like_kepler_quarter, data_label='lc 0', format='Light Curve')
+    ephem = helper.plugins['Ephemeris']
+    for i in range(1, n_ephems):
+        ephem.add_component(f'ephem{i}')
+        ephem.period = 1 + i
+
+    n_phase_updates = []
+    set_phase_component = ephem._obj._set_phase_component
+
+    def counting_set_phase_component(data, component_label, times_to_phases):
+        n_phase_updates.append((data.label, component_label))
+        return set_phase_component(data, component_label, times_to_phases)
+
+    monkeypatch.setattr(ephem._obj, '_set_phase_component', counting_set_phase_component)
+
+    # only the phases for the newly added data are computed
+    for i in range(1, n_data):
+        helper.load(light_curve_like_kepler_quarter, data_label=f'lc {i}', format='Light Curve')
+    assert len(n_phase_updates) == (n_data - 1) * n_ephems
+    assert len(set(n_phase_updates)) == len(n_phase_updates)
+
+    # changing an ephemeris only re-computes the phases for that ephemeris
+    n_phase_updates.clear()
+    ephem.update_ephemeris(ephem_component='ephem1', period=2.5)
+    assert sorted(n_phase_updates) == [(f'lc {i}', 'phase:ephem1') for i in range(n_data)]
+
+    # data added within a batch are phased once when exiting the batch
+    n_phase_updates.clear()
+    n_calls = []
+    update_all_phase_arrays = ephem._obj._update_all_phase_arrays
+
+    def counting_update(*args, **kwargs):
+        if kwargs.get('ephem_component') is None:
+            n_calls.append(args)
+        return update_all_phase_arrays(*args, **kwargs)
+
+    monkeypatch.setattr(ephem._obj, '_update_all_phase_arrays', counting_update)
+    with helper.batch_load():
+        for i in range(n_data, n_data + 2):
+            helper.load(light_curve_like_kepler_quarter, data_label=f'lc {i}',
+                        format='Light Curve')
+        assert not len(n_phase_updates)
+    assert len(n_calls) == 1
+    assert len(n_phase_updates) == 2 * n_ephems
+
+
+def test_coalesced_ephemeris_updates(helper, light_curve_like_kepler_quarter, monkeypatch):
+    helper.load(light_curve_like_kepler_quarter, format='Light Curve')
+    ephem = helper.plugins['Ephemeris']
+    ephem.period = 1.5
+
+    n_updates = []
+    apply_ephem_update = ephem._obj._apply_ephem_update
+
+    def counting_update(ephem_component):
+        n_updates.append(ephem.ephemeris['period'])
+        return apply_ephem_update(ephem_component)
+
+    monkeypatch.setattr(ephem._obj, '_apply_ephem_update', counting_update)
+
+    periods = np.linspace(2, 3, 20)
+
+    async def drag_slider():
+        # changes from the front-end are stored immediately, but phases are only updated
+        # once the (coalesced) scheduled update runs
+        for period in periods:
+            ephem._obj.set_state({'period': period})
+        assert ephem.ephemeris['period'] == periods[-1]
+        assert ephem._obj._ephem_update.pending
+        assert not len(n_updates)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(drag_slider())
+    assert n_updates == [periods[-1]]
+    phases = helper._app.data_collection[0].get_component('phase:default').data
+    times = helper._app.data_collection[0].get_component('World 0').data
+    np.testing.assert_allclose(phases, ephem.times_to_phases(times))
+
+    # changes from the API are applied immediately
+    n_updates.clear()
+    ephem.period = 4
+    assert n_updates == [4]
+    assert not ephem._obj._ephem_update.pending
+
+
+def test_lazy_phase_components(helper, light_curve_like_kepler_quarter):
+    helper.load(light_curve_like_kepler_quarter, format='Light Curve')
+    ephem = helper.plugins['Ephemeris']
+    ephem.period = 2
+    ephem.add_component('other', set_as_selected=False)
+    ephem.update_ephemeris(ephem_component='other', period=3)
+
+    data = helper._app.data_collection[0]
+    # phases shown in the default phase viewer are computed, those without a viewer are not
+    assert data.get_component('phase:default').loaded
+    phase_comp = data.get_component('phase:other')
+    assert not phase_comp.loaded
+
+    times = data.get_component('World 0').data
+    np.testing.assert_allclose(phase_comp.data, ephem.times_to_phases(times, 'other'))
+    assert phase_comp.loaded
+
+    # changing the ephemeris discards the cached phases until accessed again
+    ephem.update_ephemeris(ephem_component='other', period=4)
+    assert data.get_component('phase:other') is phase_comp
+    assert not phase_comp.loaded
+    np.testing.assert_allclose(phase_comp.data, ephem.times_to_phases(times, 'other'))
+
+
+def test_time_links_added_once(helper, light_curve_like_kepler_quarter):
+    n_data = 4
+    for i in range(n_data):
+        helper.load(light_curve_like_kepler_quarter, data_label=f'lc {i}', format='Light Curve')
+    ephem = helper.plugins['Ephemeris']
+    ephem.add_component('other')
+    for period in (2, 3, 4):
+        ephem.period = period
+
+    dc = helper._app.data_collection
+
+    def time_links():
+        return [link for link in dc.external_links if type(link) is LinkSame]
+
+    # a single star of links around the first entry, not re-added by phase updates
+    assert len(time_links()) == n_data - 1
+    assert all(link.data1 is dc[0] for link in time_links())
+
+    # links are re-created if data are removed and added again
+    data = dc[-1]
+    dc.remove(data)
+    assert len(time_links()) == n_data - 2
+    dc.append(data)
+    assert len(time_links()) == n_data - 1
+
+
+def test_background_periodogram(helper, light_curve_like_kepler_quarter, monkeypatch):
+    _periodogram_cache.clear()
+    helper.load(light_curve_like_kepler_quarter, format='Light Curve')
+    ephem = helper.plugins['Ephemeris']
+    ephem._obj._wait_for_periodogram()
+    assert not ephem._obj.method_spinner
+    ls_period = ephem.period_at_max_power
+
+    started, release = threading.Event(), threading.Event()
+    bls_periodogram = utils._bls_periodogram
+
+    def slow_bls_periodogram(lc, **kwargs):
+        started.set()
+        release.wait(10)
+        return bls_periodogram(lc, **kwargs)
+
+    monkeypatch.setattr(utils, '_bls_periodogram', slow_bls_periodogram)
+
+    results = []
+    ephem._obj.observe(lambda change: results.append(change['new']), 'period_at_max_power')
+
+    # the selection returns immediately, while the periodogram is computed in the background
+    ephem.method = 'Box Least Squares'
+    assert ephem._obj.method_spinner
+    assert started.wait(10)
+
+    # switching back supersedes the running BLS periodogram, whose result is discarded
+    ephem.method = 'Lomb-Scargle'
+    release.set()
+    ephem.adopt_period_at_max_power()
+    assert not ephem._obj.method_spinner
+    assert ephem.period_at_max_power == ls_period
+    assert ephem.period == ls_period
+    assert not len(results)
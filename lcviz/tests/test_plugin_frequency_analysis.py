@@ -1,9 +1,15 @@
+import numpy as np
 import pytest
 
-from numpy.testing import assert_allclose
+from astropy import units as u
+from numpy.testing import assert_allclose, assert_array_equal
 
 from lightkurve.periodogram import LombScarglePeriodogram, BoxLeastSquaresPeriodogram
 
+from lcviz.plugins.frequency_analysis.frequency_analysis import FrequencyAnalysis
+from lcviz.utils import (_PeriodogramCache, _periodogram_cache, _bls_periodogram,
+                         _adaptive_periodogram, _nufft_ls_periodogram)
+
 
 @pytest.mark.parametrize('helper_name', ['helper', 'deconfigged_helper'])
 def test_docs_snippets(helper_name, light_curve_like_kepler_quarter, request):
@@ -58,3 +64,245 @@ def test_plugin_frequency_analysis(helper_name, light_curve_like_kepler_quarter,
         pass
     line_x = freq._obj.plot.layers['periodogram'].layer['x']
     assert_allclose((line_x.min(), line_x.max()), (0.0999859, 1))
+
+
+def test_shared_periodogram_cache(helper, light_curve_like_kepler_quarter, monkeypatch):
+    _periodogram_cache.clear()
+    n_computed = []
+    from_lightcurve = LombScarglePeriodogram.from_lightcurve
+
+    def counting_from_lightcurve(lc, **kwargs):
+        n_computed.append(kwargs)
+        return from_lightcurve(lc, **kwargs)
+
+    monkeypatch.setattr(LombScarglePeriodogram, 'from_lightcurve', counting_from_lightcurve)
+
+    helper.load(light_curve_like_kepler_quarter, format='Light Curve')
+    ephem = helper.plugins['Ephemeris']
+    ephem._obj._wait_for_periodogram()
+    freq = helper.plugins['Frequency Analysis']
+    assert isinstance(freq.periodogram, LombScarglePeriodogram)
+    # computed once and shared between the plugins
+    assert len(n_computed) == 1
+    assert freq.periodogram.period_at_max_power.value == ephem.period_at_max_power
+
+    # the range is ignored with auto_range
+    freq.minimum = 0.2
+    assert len(n_computed) == 1
+
+    # switching back to a previous configuration re-uses the cached periodogram
+    freq.method = 'Box Least Squares'
+    freq.method = 'Lomb-Scargle'
+    assert len(n_computed) == 1
+
+    freq.auto_range = False
+    assert len(n_computed) == 2
+    freq.auto_range = True
+    assert len(n_computed) == 2
+
+
+def test_periodogram_cache_eviction(light_curve_like_kepler_quarter):
+    cache = _PeriodogramCache()
+    lc = light_curve_like_kepler_quarter
+    per = cache.get(lc, 'Lomb-Scargle')
+    assert cache.get(lc, 'Lomb-Scargle', maximum_period=None) is per
+
+    # least recently used entries are evicted above the memory cap
+    cache.max_bytes = cache._nbytes_of(per) * 2.5
+    per_short = cache.get(lc, 'Lomb-Scargle', maximum_period=10)
+    assert cache.get(lc, 'Lomb-Scargle') is per
+    cache.get(lc, 'Lomb-Scargle', maximum_period=5)
+    assert len(cache._entries) == 2
+    assert cache.get(lc, 'Lomb-Scargle') is per
+    assert cache.get(lc, 'Lomb-Scargle', maximum_period=10) is not per_short
+
+    # the key depends on the content of the light curve
+    assert cache.get(lc * 2, 'Lomb-Scargle') is not per
+
+
+@pytest.mark.parametrize('max_workers', [1, 3])
+def test_parallel_bls_matches_serial(light_curve_like_kepler_quarter, max_workers):
+    lc = light_curve_like_kepler_quarter
+    kwargs = {'minimum_period': 1, 'maximum_period': 3}
+    serial = BoxLeastSquaresPeriodogram.from_lightcurve(lc, **kwargs)
+    per = _bls_periodogram(lc, max_workers=max_workers, **kwargs)
+    assert isinstance(per, BoxLeastSquaresPeriodogram)
+    for attr in ('period', 'power', 'depth', 'duration', 'snr', 'transit_time'):
+        assert_array_equal(getattr(per, attr).value, getattr(serial, attr).value)
+    assert per.period_at_max_power == serial.period_at_max_power
+
+
+def test_adaptive_grid(helper, light_curve_like_kepler_quarter):
+    lc = light_curve_like_kepler_quarter.copy()
+    lc.flux = lc.flux + 0.005 * np.sin(2 * np.pi * lc.time.value / 2.5)
+    helper.load(lc, format='Light Curve')
+
+    freq = helper.plugins['Frequency Analysis']
+    assert freq.grid == 'uniform'
+    dense = freq.periodogram
+    freq.grid = 'adaptive'
+    adaptive = freq.periodogram
+    assert isinstance(adaptive, LombScarglePeriodogram)
+    assert adaptive.period_at_max_power == dense.period_at_max_power
+    assert_allclose(adaptive.period_at_max_power.value, 2.5, rtol=1e-2)
+    assert len(adaptive.frequency) < len(dense.frequency) / 5
+    assert np.all(np.diff(adaptive.frequency.value) > 0)
+
+
+def test_adaptive_bls(light_curve_like_kepler_quarter):
+    lc = light_curve_like_kepler_quarter.copy()
+    lc.flux[(lc.time.value % 3.3) < 0.1] -= 0.02
+    kwargs = {'minimum_period': 1, 'maximum_period': 5}
+    dense = BoxLeastSquaresPeriodogram.from_lightcurve(lc, **kwargs)
+    adaptive = _adaptive_periodogram(lc, 'Box Least Squares', **kwargs)
+    assert adaptive.period_at_max_power == dense.period_at_max_power
+    assert adaptive.max_power == dense.max_power
+    assert len(adaptive.period) < len(dense.period) / 5
+    # results are re-ordered consistently with the period grid
+    assert np.all(np.diff(adaptive.period.value) > 0)
+    inds = np.searchsorted(dense.period.value, adaptive.period.value)
+    assert_array_equal(adaptive.power.value, dense.power.value[inds])
+    assert_array_equal(adaptive.transit_time.value, dense.transit_time.value[inds])
+
+
+def test_periodogram_display_decimation(helper, light_curve_like_kepler_quarter, monkeypatch):
+    monkeypatch.setattr(FrequencyAnalysis, '_display_bins', 100)
+    helper.load(light_curve_like_kepler_quarter, format='Light Curve')
+    freq = helper.plugins['Frequency Analysis']
+
+    per = freq.periodogram
+    layer = freq._obj.plot.layers['periodogram'].layer
+    # a min/max envelope of the full resolution periodogram is plotted
+    assert len(layer['x']) == 4 * 100 + 8 < len(per.frequency)
+    assert layer['y'].max() == per.power.value.max()
+    assert layer['y'].min() == per.power.value.min()
+    assert_allclose((layer['x'].min(), layer['x'].max()),
+                    (per.frequency.value.min(), per.frequency.value.max()))
+
+    # zooming in plots all samples within the new limits
+    x_min, x_max = per.frequency.value[[1000, 1100]]
+    freq._obj.plot.set_limits(x_min=x_min, x_max=x_max)
+    layer = freq._obj.plot.layers['periodogram'].layer
+    in_range = (per.frequency.value >= x_min) & (per.frequency.value <= x_max)
+    assert np.all(np.isin(per.frequency.value[in_range], layer['x']))
+
+    # switching units re-sends the envelope in the new units
+    freq.xunit = 'period'
+    layer = freq._obj.plot.layers['periodogram'].layer
+    assert layer['y'].max() == per.power.value.max()
+    assert_allclose((layer['x'].min(), layer['x'].max()),
+                    (per.period.value.min(), per.period.value.max()))
+
+
+def test_batch_periodograms(helper, light_curve_like_kepler_quarter):
+    periods = (2.5, 4.2, 7.7)
+    for period in periods:
+        lc = light_curve_like_kepler_quarter.copy()
+        lc.flux = lc.flux + 0.005 * np.sin(2 * np.pi * lc.time.value / period)
+        helper.load(lc, format='Light Curve', data_label=f'lc {period}')
+
+    freq = helper.plugins['Frequency Analysis']
+    peaks = freq.batch_periodograms(top_k=2)
+    assert len(peaks) == 2 * len(periods)
+    assert list(peaks['dataset']) == [f'lc {period}' for period in periods for _ in range(2)]
+    assert list(peaks['rank']) == [1, 2] * len(periods)
+
+    best = peaks[peaks['rank'] == 1]
+    assert_allclose(best['period'].value, periods, rtol=1e-2)
+    assert np.all(best['false_alarm_probability'] < 1e-10)
+    assert np.all(best['sde'] > 10)
+    # consistent with the periodogram of the selected dataset
+    freq.dataset = 'lc 4.2'
+    assert best['period'][1] == freq.periodogram.period_at_max_power
+    assert best['power'][1] == freq.periodogram.max_power.value
+
+    freq.method = 'Box Least Squares'
+    freq.auto_range = False
+    peaks = freq.batch_periodograms(datasets='lc 4.2', top_k=1)
+    assert len(peaks) == 1
+    assert peaks['period'][0] == freq.periodogram.period_at_max_power
+    assert np.isnan(peaks['false_alarm_probability'][0])
+
+    with pytest.raises(ValueError, match='not a valid dataset'):
+        freq.batch_periodograms(datasets=['not a dataset'])
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'minimum_period': 1, 'maximum_period': 10}])
+def test_nufft_lombscargle(light_curve_like_kepler_quarter, kwargs):
+    lc = light_curve_like_kepler_quarter.copy()
+    lc.flux = lc.flux + 0.005 * np.sin(2 * np.pi * lc.time.value / 2.5)
+    # gaps are handled without resampling
+    lc = lc[(lc.time.value % 7) > 1]
+    expected = LombScarglePeriodogram.from_lightcurve(lc, **kwargs)
+    per = _nufft_ls_periodogram(lc, **kwargs)
+    assert isinstance(per, LombScarglePeriodogram)
+    assert_allclose(per.frequency.value, expected.frequency.value)
+    assert per.power.unit == expected.power.unit
+    assert_allclose(per.power.value, expected.power.value, rtol=1e-7, atol=1e-12)
+    assert_allclose(per.period_at_max_power.value, expected.period_at_max_power.value,
+                    rtol=1e-12)
+    assert per.nyquist == expected.nyquist
+
+
+def test_nufft_method_and_multiselect(helper, light_curve_like_kepler_quarter):
+    lc = light_curve_like_kepler_quarter.copy()
+    lc.flux = lc.flux + 0.005 * np.sin(2 * np.pi * lc.time.value / 2.5)
+    helper.load(lc, format='Light Curve', data_label='lc 1')
+    lc2 = lc.copy()
+    lc2.time = lc2.time + 100 * u.d
+    helper.load(lc2, format='Light Curve', data_label='lc 2')
+
+    freq = helper.plugins['Frequency Analysis']
+    freq.dataset = 'lc 1'
+    expected = freq.periodogram
+    freq.method = 'Lomb-Scargle (NUFFT)'
+    assert freq._obj.err == ''
+    per = freq.periodogram
+    assert isinstance(per, LombScarglePeriodogram)
+    assert_allclose(per.power.value, expected.power.value, rtol=1e-7, atol=1e-12)
+
+    # combining datasets stitches the light curves into a single periodogram
+    freq.multiselect = True
+    freq.dataset = ['lc 1', 'lc 2']
+    assert freq._obj.err == ''
+    combined = freq.periodogram
+    assert len(combined.frequency) > len(per.frequency)
+    assert_allclose(combined.period_at_max_power.value, 2.5, rtol=1e-2)
+
+    freq.dataset = []
+    assert freq.periodogram is None
+    assert freq._obj.err == 'no datasets selected'
+
+
+def test_prewhiten(helper, light_curve_like_kepler_quarter):
+    lc = light_curve_like_kepler_quarter.copy()
+    periods, amplitudes = (2.5, 4.2, 0.7), (0.05, 0.03, 0.02)
+    for period, amplitude in zip(periods, amplitudes):
+        lc.flux = lc.flux + amplitude * np.sin(2 * np.pi * lc.time.value / period + 1)
+    helper.load(lc, format='Light Curve')
+
+    freq = helper.plugins['Frequency Analysis']
+    freq.prewhiten_n_frequencies = 3
+    table, residual_lc = freq.prewhiten()
+    assert len(table) == 3
+    # extracted in order of decreasing amplitude
+    assert_allclose(table['period'].value, periods, rtol=1e-3)
+    assert_allclose(table['amplitude'].value, amplitudes, rtol=0.05)
+    assert np.all(np.diff(table['power'].value) < 0)
+    assert len(freq._obj.prewhiten_table.items) == 3
+    # only the noise (with a standard deviation of 0.01) is left in the residuals
+    assert_allclose(np.nanstd(residual_lc.flux.value), 0.01, rtol=0.05)
+    flux_column = freq._obj.flux_column.selected
+    label = freq._obj.prewhiten_flux_label.value
+    assert label == f'{flux_column}_prewhitened'
+    assert label not in freq._obj.flux_column.choices
+
+    freq.prewhiten(add_data=True)
+    assert label in freq._obj.flux_column.choices
+    # the residuals are added without changing the selected flux column
+    assert freq._obj.flux_column.selected == flux_column
+    assert freq._obj.prewhiten_flux_label_overwrite
+
+    freq.multiselect = True
+    with pytest.raises(ValueError, match='cannot add residuals'):
+        freq.prewhiten(add_data=True)
@@ -0,0 +1,183 @@
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+from astropy.coordinates import SkyCoord
+from astropy.table import MaskedColumn, Table
+from lightkurve.search import SearchResult
+
+from lcviz.loaders.resolvers.lightkurve import lightkurve as lk_resolver
+from lcviz.utils import _DiskCache
+
+
+def _fake_search_result(n=4, uris=None):
+    if uris is None:
+        uris = [f'mast:lc_{i}.fits' for i in range(n)]
+    return SearchResult(Table({
+        'target_name': [f'TIC {i}' for i in range(n)],
+        'obs_collection': ['TESS'] * n,
+        'author': ['SPOC', 'QLP'] * (n // 2),
+        'description': ['Light curves'] * n,
+        'exptime': MaskedColumn(np.full(n, 120.), mask=np.arange(n) == 0),
+        'dataURI': uris,
+        'distance': np.zeros(n),
+        't_min': np.full(n, 58600.),
+        'productFilename': [f'lc_{i}.fits' for i in range(n)],
+        'mission': ['TESS Sector 1'] * n,
+    }))
+
+
+def test_search_result_to_table():
+    table = lk_resolver.LightkurveResolver._search_result_to_table(_fake_search_result())
+    assert table.colnames == ['#', 'target_name', 'obs_collection', 'author',
+                              'year', 'description', 'exptime', 'dataURI']
+    # masked entries are replaced by empty strings
+    assert sorted(table['exptime']) == ['', '120.0', '120.0', '120.0']
+    assert list(table['year']) == [2019] * 4
+
+
+def test_query_cache(deconfigged_helper, tmp_path, monkeypatch):
+    # local stand-ins for the name resolver and the archive
+    n_queries = {'from_name': 0, 'search': 0}
+
+    def fake_from_name(name, frame='icrs', **kwargs):
+        n_queries['from_name'] += 1
+        return SkyCoord(10, 20, unit='deg', frame=frame)
+
+    def fake_search_lightcurve(**kwargs):
+        n_queries['search'] += 1
+        return _fake_search_result()
+
+    monkeypatch.setattr(SkyCoord, 'from_name', fake_from_name)
+    monkeypatch.setattr(lk_resolver, 'search_lightcurve', fake_search_lightcurve)
+    monkeypatch.setattr(lk_resolver, '_query_cache',
+                        _DiskCache('lightkurve_queries', ttl=60, cache_dir=tmp_path))
+
+    ldr = deconfigged_helper.loaders['lightkurve']
+    ldr.source = 'TIC 1'
+    ldr.mission = 'TESS'
+    ldr.data_type = 'Light Curve'
+    ldr.query_archive()
+    assert n_queries == {'from_name': 1, 'search': 1}
+    assert len(ldr._obj._output) == 4
+
+    ldr.query_archive()
+    assert n_queries == {'from_name': 1, 'search': 1}
+
+    # a different key requires a new search (but not name resolution)
+    ldr.max_results = 50
+    ldr.query_archive()
+    assert n_queries == {'from_name': 1, 'search': 2}
+
+    # entries persist on disk for a new session
+    monkeypatch.setattr(lk_resolver, '_query_cache',
+                        _DiskCache('lightkurve_queries', ttl=60, cache_dir=tmp_path))
+    ldr.query_archive()
+    assert n_queries == {'from_name': 1, 'search': 2}
+
+    # expired entries are only used when offline
+    monkeypatch.setattr(lk_resolver, '_query_cache',
+                        _DiskCache('lightkurve_queries', ttl=0, cache_dir=tmp_path))
+    ldr.offline = True
+    ldr.query_archive()
+    assert n_queries == {'from_name': 1, 'search': 2}
+
+    # uncached queries are not sent while offline
+    ldr.source = 'TIC 2'
+    ldr.query_archive()
+    assert n_queries == {'from_name': 1, 'search': 2}
+
+    ldr.offline = False
+    ldr.query_archive()
+    assert n_queries == {'from_name': 2, 'search': 3}
+
+    ldr.clear_query_cache()
+    assert not len(list((tmp_path / 'lightkurve_queries').glob('*.pkl')))
+
+
+@pytest.fixture
+def local_archive(tmp_path):
+    # local HTTP stand-in for the archive, serving (and counting requests for) files in a
+    # temporary directory
+    archive_dir = tmp_path / 'archive'
+    archive_dir.mkdir()
+    requested = []
+
+    class Handler(SimpleHTTPRequestHandler):
+        def do_GET(self):
+            requested.append(self.path)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(Handler, directory=archive_dir))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', archive_dir, requested
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_products(deconfigged_helper, light_curve_like_kepler_quarter,
+                           local_archive, tmp_path, monkeypatch):
+    url, archive_dir, requested = local_archive
+    monkeypatch.setattr(lk_resolver, '_product_cache_dir', tmp_path / 'products')
+
+    uris = []
+    for i in range(3):
+        (light_curve_like_kepler_quarter * (i + 1)).to_fits(archive_dir / f'lc_{i}.fits')
+        uris.append(f'{url}/lc_{i}.fits')
+
+    ldr = deconfigged_helper.loaders['lightkurve']
+    paths = ldr.download_products(uris)
+    assert len(requested) == 3
+    assert [path.split('/')[-1] for path in paths] == ['lc_0.fits', 'lc_1.fits', 'lc_2.fits']
+    for i, path in enumerate(paths):
+        with open(path, 'rb') as f:
+            assert f.read() == (archive_dir / f'lc_{i}.fits').read_bytes()
+    assert ldr._obj.spinner == ''
+
+    # cached products are re-used without any network access (also when offline)
+    ldr.offline = True
+    assert ldr.download_products(uris) == paths
+    assert len(requested) == 3
+
+    with pytest.raises(ValueError, match="not cached"):
+        ldr.download_products([f'{url}/lc_3.fits'])
+
+    # failed downloads are not cached
+    ldr.offline = False
+    with pytest.raises(Exception):
+        ldr.download_products([f'{url}/lc_3.fits'])
+    assert not lk_resolver._product_cache_path(f'{url}/lc_3.fits').exists()
+
+
+def test_load_multiple_products(deconfigged_helper, light_curve_like_kepler_quarter,
+                                local_archive, tmp_path, monkeypatch):
+    url, archive_dir, requested = local_archive
+    monkeypatch.setattr(lk_resolver, '_product_cache_dir', tmp_path / 'products')
+    monkeypatch.setattr(lk_resolver, '_query_cache',
+                        _DiskCache('lightkurve_queries', cache_dir=tmp_path))
+    monkeypatch.setattr(SkyCoord, 'from_name',
+                        lambda name, frame='icrs', **kwargs: SkyCoord(10, 20, unit='deg'))
+
+    search_result = _fake_search_result(n=2)
+    search_result.table['dataURI'] = [f'{url}/lc_{i}.fits' for i in range(2)]
+    monkeypatch.setattr(lk_resolver, 'search_lightcurve', lambda **kwargs: search_result)
+    for i in range(2):
+        light_curve_like_kepler_quarter.to_fits(archive_dir / f'lc_{i}.fits')
+
+    ldr = deconfigged_helper.loaders['lightkurve']
+    ldr.source = 'TIC 1'
+    ldr.query_archive()
+    ldr._obj.file_table.select_all()
+    # all selected products are downloaded when selected, and re-used when loading
+    assert sorted(requested) == ['/lc_0.fits', '/lc_1.fits']
+
+    ldr.load()
+    assert len(requested) == 2
+    dc_labels = sorted(data.label for data in deconfigged_helper._app.data_collection)
+    assert [label.split(' ')[0] for label in dc_labels] == ['lc_0', 'lc_1']
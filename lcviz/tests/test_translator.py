@@ -2,9 +2,11 @@ import os
 import pytest
 from glue.core import DataCollection
 from glue.core.roi import XRangeROI
+from glue.core.subset import RangeSubsetState
 import numpy as np
 from astropy.time import Time
 from lightkurve import search_lightcurve, LightCurve
+import astropy.units as u
 
 
 SMALL_LC_PATH = os.path.join(
@@ -85,3 +87,84 @@ def test_round_trip(helper_name, request):
 
     for column in lc_subset.values_equal(subset_translated).itercols():
         assert np.all(column)
+
+
+@pytest.mark.parametrize('cadence', ['uniform', 'gapped', 'jittered'])
+def test_time_coordinates_match_interp1d(cadence):
+    from scipy.interpolate import interp1d
+    from lcviz.utils import TimeCoordinates
+
+    rng = np.random.default_rng(42)
+    offsets = np.arange(1000) * 0.02
+    if cadence == 'gapped':
+        offsets[500:] += 3.7
+    elif cadence == 'jittered':
+        offsets += rng.uniform(0, 1e-3, size=len(offsets))
+    times = Time(2455000 + offsets, format='jd')
+    coords = TimeCoordinates(times)
+    assert coords.is_uniform == (cadence == 'uniform')
+
+    index = np.arange(len(offsets))
+    world = coords.offsets
+    # include values well outside of the time axis to test extrapolation
+    test_world = np.concatenate([rng.uniform(-5, world[-1] + 5, size=200), [np.nan]])
+    test_pixel = np.concatenate([rng.uniform(-50, len(index) + 50, size=200), [np.nan]])
+
+    expected_pixel = interp1d(world, index, fill_value='extrapolate')(test_world)
+    expected_world = interp1d(index, world, fill_value='extrapolate')(test_pixel)
+    np.testing.assert_allclose(coords.world_to_pixel_values(test_world), expected_pixel,
+                               rtol=1e-8, atol=1e-6)
+    np.testing.assert_allclose(coords.pixel_to_world_values(test_pixel), expected_world,
+                               rtol=1e-8, atol=1e-8)
+
+    # scalars are supported and round-trip through the transform
+    assert np.shape(coords.world_to_pixel_values(world[10])) == ()
+    np.testing.assert_allclose(coords.world_to_pixel_values(coords.pixel_to_world_values(123.4)),
+                               123.4)
+
+
+def test_time_coordinates_lazy_time_axis(light_curve_like_kepler_quarter):
+    light_curve = light_curve_like_kepler_quarter
+    dc = DataCollection()
+    dc['dummy-lc'] = light_curve
+    data = dc['dummy-lc']
+    coords = data.coords
+
+    # the Time object is not built until requested, and the dt component
+    # shares its buffer with the coordinates
+    assert coords._times is None
+    assert np.shares_memory(data.get_component('dt').data, coords.offsets)
+
+    time_axis = coords.time_axis
+    assert coords.time_axis is time_axis
+    assert time_axis.format == light_curve.time.format
+    assert time_axis.scale == light_curve.time.scale
+    np.testing.assert_allclose((time_axis - light_curve.time).to_value(u.s), 0, atol=1e-6)
+
+
+def test_to_object_shares_buffers(light_curve_like_kepler_quarter):
+    light_curve = light_curve_like_kepler_quarter
+    dc = DataCollection()
+    dc['dummy-lc'] = light_curve
+    data = dc['dummy-lc']
+
+    # without a subset, columns (other than the time, flux and flux_err columns which are
+    # copied by LightCurve) are read-only views of the component buffers
+    translated_lc = data.get_object()
+    for attr in ('quality', 'flux_alt'):
+        values = getattr(translated_lc[attr], 'unmasked', translated_lc[attr])
+        assert np.shares_memory(np.asarray(values), data.get_component(attr).data)
+    with pytest.raises(ValueError, match='read-only'):
+        translated_lc.flux_alt[0] = 0
+    translated_lc.flux[0] = 0
+    assert data.get_component('flux').data[0] != 0
+    assert translated_lc.colnames[:3] == ['time', 'flux', 'flux_err']
+
+    # contiguous subsets are also returned as views
+    time = data.get_component('dt').data
+    dc.new_subset_group(subset_state=RangeSubsetState(time[11], time[19], data.id['dt']))
+    subset_lc = data.get_subset_object(cls=LightCurve)
+    assert len(subset_lc) == 9
+    assert np.shares_memory(np.asarray(subset_lc.flux_alt.unmasked),
+                            data.get_component('flux_alt').data)
+    np.testing.assert_allclose(subset_lc.flux.value, light_curve.flux.value[11:20])
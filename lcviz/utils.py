@@ -3,14 +3,24 @@ from glue.core import Data, Subset
 from ipyvue import watch
 import warnings
 
+import asyncio
+import hashlib
 import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from glue.core.coordinates import Coordinates
+from glue.core.component import Component
 from glue.core.component_id import ComponentID
+from glue.core.link_helpers import LinkSame
+from glue.utils import coerce_numeric
 import numpy as np
-from scipy.interpolate import interp1d
 
 from lightkurve import (
-    LightCurve, KeplerLightCurve, TessLightCurve, FoldedLightCurve
+    LightCurve, KeplerLightCurve, TessLightCurve, FoldedLightCurve, periodogram
 )
 from lightkurve.targetpixelfile import (
     KeplerTargetPixelFile, TessTargetPixelFile,
@@ -21,10 +31,12 @@ from lightkurve.utils import KeplerQualityFlags, TessQualityFlags
 from astropy import units as u
 from astropy.table import QTable
 from astropy.time import Time
+from astropy.timeseries import BoxLeastSquares, LombScargle
+from astropy.timeseries.periodograms.bls.core import BoxLeastSquaresResults
 from astropy.wcs.wcsapi.wrappers.base import BaseWCSWrapper
 from astropy.wcs.wcsapi import HighLevelWCSMixin
 
-__all__ = ['TimeCoordinates', 'LightCurveHandler',
+__all__ = ['TimeCoordinates', 'LazyComponent', 'LightCurveHandler',
            'phase_comp_lbl',
            'data_not_folded',
            'is_lc', 'is_tpf', 'is_not_tpf',
@@ -38,42 +50,187 @@ class TimeCoordinates(Coordinates):
     """
     This is a sub-class of Coordinates that is intended for a time axis
     given by a :class:`~astropy.time.Time` array.
+
+    Only a single float64 buffer of offsets (in ``unit``) from ``reference_time`` is stored,
+    along with the scale and format of the input times.  The full :class:`~astropy.time.Time`
+    array is rebuilt (and then cached) the first time `time_axis` is accessed.
+
+    The mapping between pixel indices and time offsets is precomputed once on
+    initialization.  If the cadence is uniform, conversions use an affine transform,
+    otherwise they use a piecewise-linear lookup (with ``np.searchsorted``).  In both
+    cases, values outside the time axis are linearly extrapolated from the first and
+    last samples.
     """
+    # maximum deviation (in pixels) from a uniform grid for the affine fast-path to be used
+    _uniform_tolerance = 1e-6
 
     def __init__(self, times, reference_time=None, unit=u.d):
         if not isinstance(times, Time):  # pragma: no cover
             raise TypeError('values should be a Time instance')
-        self._index = np.arange(len(times))
-        self._times = times
         self.unit = unit
+        self._time_scale = times.scale
+        self._time_format = times.format
+        self._time_location = times.location
+        # built on first access to time_axis
+        self._times = None
 
         # convert to relative time units
         self.reference_time = reference_time
         if self.reference_time is None:
             self.reference_time = times[0]
-        self._values = (times - self.reference_time).to(unit)
+        self._offsets = np.asarray((times - self.reference_time).to_value(unit), dtype=float)
+        self._build_lookup()
 
         super().__init__(n_dim=1)
 
+    def _build_lookup(self):
+        values = self._offsets
+        n = len(values)
+        # affine transform: world = _world0 + _step * pixel
+        self._step = None
+        self._world0 = values[0] if n else 0.0
+        # piecewise-linear lookup, only needed if values are not already sorted
+        self._order = None
+        self._sorted_offsets = values
+
+        if n < 2:
+            return
+
+        step = (values[-1] - values[0]) / (n - 1)
+        if step != 0 and np.all(np.isfinite(values)):
+            residuals = values - (values[0] + step * np.arange(n))
+            if np.max(np.abs(residuals)) <= self._uniform_tolerance * abs(step):
+                self._step = step
+                return
+
+        # interp1d sorts its inputs, so do the same here (once) for the world -> pixel direction
+        if not np.all(values[1:] >= values[:-1]):
+            self._order = np.argsort(values, kind='stable')
+            self._sorted_offsets = values[self._order]
+
+    @property
+    def offsets(self):
+        """
+        Time offsets from ``reference_time`` (in ``unit``), as a read-only array.  This buffer is
+        shared with the ``dt`` component of light curves.
+        """
+        offsets = self._offsets.view()
+        offsets.flags.writeable = False
+        return offsets
+
     @property
     def time_axis(self):
+        if self._times is None:
+            # do the arithmetic in the scale of the original times so that
+            # the reconstructed times match to floating-point precision
+            reference_time = getattr(self.reference_time, self._time_scale)
+            times = reference_time + u.Quantity(self._offsets, self.unit, copy=False)
+            times.format = self._time_format
+            if self._time_location is not None:
+                times.location = self._time_location
+            self._times = times
         return self._times
 
+    @property
+    def is_uniform(self):
+        """
+        Whether the time axis has a uniform cadence (and so uses the affine fast-path).
+        """
+        return self._step is not None
+
     def world_to_pixel_values(self, *world):
         if len(world) > 1:  # pragma: no cover
             raise ValueError('TimeCoordinates is a 1-d coordinate class '
                              'and only accepts a single scalar or array to convert')
-        return interp1d(
-            self._values.value, self._index, fill_value='extrapolate'
-        )(world[0])
+        world = np.asarray(world[0], dtype=float)
+        if self._step is not None:
+            return (world - self._world0) / self._step
+        if len(self._offsets) < 2:
+            return np.zeros_like(world)
+
+        x = self._sorted_offsets
+        i = np.clip(np.searchsorted(x, world, side='right') - 1, 0, len(x) - 2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = (world - x[i]) / (x[i + 1] - x[i])
+        if self._order is None:
+            return i + frac
+        return self._order[i] + frac * (self._order[i + 1] - self._order[i])
 
     def pixel_to_world_values(self, *pixel):
         if len(pixel) > 1:  # pragma: no cover
-            raise ValueError('SpectralCoordinates is a 1-d coordinate class '
+            raise ValueError('TimeCoordinates is a 1-d coordinate class '
                              'and only accepts a single scalar or array to convert')
-        return interp1d(
-            self._index, self._values.value, fill_value='extrapolate'
-        )(pixel[0])
+        pixel = np.asarray(pixel[0], dtype=float)
+        if self._step is not None:
+            return self._world0 + self._step * pixel
+        if len(self._offsets) < 2:
+            return np.full_like(pixel, self._world0)
+
+        # pixel indices are uniformly spaced, so the segment is found directly
+        values = self._offsets
+        with np.errstate(invalid='ignore'):
+            i = np.clip(np.floor(np.nan_to_num(pixel)), 0, len(values) - 2).astype(int)
+        return values[i] + (pixel - i) * (values[i + 1] - values[i])
+
+
+class LazyComponent(Component):
+    """
+    A glue Component of numeric values that are only loaded (by calling ``loader``) when first
+    accessed, for example to defer decoding columns of a memory-mapped FITS table or computing
+    phases for an ephemeris (see ``reset``).
+
+    Parameters
+    ----------
+    loader : callable
+        Function that takes no arguments and returns the array of values.
+    shape : tuple
+        Shape of the array returned by ``loader``.
+    dtype : `~numpy.dtype`
+        Data type of the array returned by ``loader``.
+    units : str, optional
+        Unit label.
+    """
+    def __init__(self, loader, shape, dtype, units=None):
+        # the data is set to None here (see the ``_data`` setter) until first accessed
+        super().__init__(None, units=units)
+        self._loader = loader
+        self._shape = tuple(shape)
+        self._dtype = np.dtype(dtype)
+
+    @property
+    def loaded(self):
+        """Whether the values have been loaded."""
+        return self._loaded is not None
+
+    def reset(self, loader):
+        """
+        Discard the loaded values (if any), to be replaced by the output of ``loader`` when next
+        accessed.  The shape and data type must be unchanged.
+        """
+        self._loader = loader
+        self._loaded = None
+
+    @property
+    def _data(self):
+        if self._loaded is None:
+            data = coerce_numeric(np.asarray(self._loader()))
+            data.setflags(write=False)  # data is read-only
+            self._loaded = data
+            self._loader = None
+        return self._loaded
+
+    @_data.setter
+    def _data(self, value):
+        self._loaded = value
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def numeric(self):
+        # avoid loading the data just to check the data type
+        return np.can_cast(self._dtype, complex)
 
 
 class PaddedTimeWCS(BaseWCSWrapper, HighLevelWCSMixin):
@@ -189,7 +346,11 @@ class LightCurveHandler:
         data.meta.update(
             {"reference_time": time_coord.reference_time}
         )
-        data[component_ids['dt']] = (obj.time - time_coord.reference_time).to(time_coord.unit)
+        if time is obj.time:
+            # share the offset buffer with the coordinates rather than storing a copy
+            data[component_ids['dt']] = time_coord.offsets
+        else:
+            data[component_ids['dt']] = (obj.time - time_coord.reference_time).to(time_coord.unit)
         data.get_component('dt').units = str(time_coord.unit)
 
         # LightCurve is a subclass of astropy TimeSeries, so
@@ -214,6 +375,13 @@ class LightCurveHandler:
                 except KeyError:  # pragma: no cover
                     continue
 
+        # columns which were deferred when parsing the input (see
+        # lcviz.loaders.importers.lightcurve.hdulist_to_lightcurve):
+        for component_label, component in getattr(obj, '_lcviz_lazy_components', {}).items():
+            if component_label not in component_ids:
+                component_ids[component_label] = ComponentID(component_label)
+            data.add_component(component, component_ids[component_label])
+
         data.meta.update({'uncertainty_type': 'std'})
 
         # if the anticipated x and y axes are the first two components in the
@@ -255,13 +423,15 @@ class LightCurveHandler:
         time = data.coords.time_axis
 
         if subset_state is None:
-            # pass through mask of all True's if no glue subset is chosen
-            glue_mask = np.ones(len(time)).astype(bool)
+            # no glue subset is chosen, so use the component buffers directly
+            glue_mask = None
         else:
-            # get the subset mask from glue:
-            glue_mask = data.get_mask(subset_state=subset_state)
+            # get the subset mask from glue (as a slice, if possible, to avoid copies):
+            glue_mask = _mask_to_slice(data.get_mask(subset_state=subset_state))
             # apply the subset mask to the time array:
             time = time[glue_mask]
+        # whether the columns will be views into the arrays stored in the data object
+        is_view = not isinstance(glue_mask, np.ndarray)
 
         columns = [time]
         names = ['time']
@@ -280,13 +450,17 @@ class LightCurveHandler:
                 continue
             component = data.get_component(component_id)
 
-            values = component.data[glue_mask]
+            values = component.data if glue_mask is None else component.data[glue_mask]
+            if is_view and isinstance(values, np.ndarray):
+                # protect the data-collection entry from in-place changes to the light curve
+                values = values.view()
+                values.flags.writeable = False
 
             if len(values) and isinstance(values[0], Time):
                 values = Time(values.base)
             elif hasattr(component, 'units') and component.units != "None":
                 try:
-                    values = u.Quantity(values, component.units)
+                    values = u.Quantity(values, component.units, copy=False)
                 except TypeError:
                     if component.units != "":
                         raise
@@ -297,8 +471,23 @@ class LightCurveHandler:
                 columns.append(values)
                 names.append(component_id.label)
 
+        # NOTE: LightCurve.__init__ re-adds (and so copies) the time, flux, and flux_err columns,
+        # all other columns remain (read-only) views when possible
         table = QTable(columns, names=names, masked=True, copy=False)
-        return LightCurve(table, **kwargs)
+        return LightCurve(table, copy=False, **kwargs)
+
+
+def _mask_to_slice(mask):
+    """
+    Convert a boolean mask to an equivalent slice if the selected entries are contiguous,
+    so that indexing returns views instead of copies.  Otherwise, return the mask.
+    """
+    indices = np.flatnonzero(mask)
+    if not len(indices):
+        return slice(0, 0)
+    if indices[-1] - indices[0] + 1 == len(indices):
+        return slice(indices[0], indices[-1] + 1)
+    return mask
 
 
 class TPFHandler:
@@ -342,9 +531,7 @@ class TPFHandler:
         )
 
         data[component_ids['dt']] = np.broadcast_to(
-            (
-                obj.time - coords.temporal_wcs.reference_time
-            ).to(coords.temporal_wcs.unit)[:, None, None], flux_shape
+            coords.temporal_wcs.offsets[:, None, None], flux_shape
         )
         data.get_component('dt').units = str(coords.temporal_wcs.unit)
 
@@ -556,3 +743,1092 @@ def _data_with_reftime(app, light_curve):
             return handler.to_data(light_curve, reference_time=ff_reference_time)
     else:
         raise ValueError(f"No handler found for {light_curve} of type {type(light_curve)}")
+
+
+class _TimeLinkRegistry:
+    """
+    Links between the time axes of data in a data collection, with each data linked (once) to a
+    single reference data so that the links form a star around the reference, rather than adding
+    new (duplicate) links whenever data are added or phases are updated.
+
+    Parameters
+    ----------
+    data_collection : `~glue.core.data_collection.DataCollection`
+        Data collection containing the data to link.
+    """
+    def __init__(self, data_collection):
+        self._dc = data_collection
+        # (reference uuid, data uuid): link
+        self._links = {}
+
+    @classmethod
+    def for_app(cls, app):
+        """
+        The registry of the data collection of ``app``, created when first accessed.
+        """
+        registry = getattr(app, '_lcviz_time_links', None)
+        if registry is None or registry._dc is not app.data_collection:
+            registry = cls(app.data_collection)
+            app._lcviz_time_links = registry
+        return registry
+
+    def link(self, datasets, reference_data=None):
+        """
+        Link the time axis of each entry in ``datasets`` to that of ``reference_data``, unless
+        already linked.
+
+        Parameters
+        ----------
+        datasets : list of `~glue.core.data.Data`
+            Data to link.
+        reference_data : `~glue.core.data.Data`, optional
+            Center of the star of links.  Defaults to the first entry in the data collection.
+
+        Returns
+        -------
+        new_links : list
+            Links that were added to the data collection.
+        """
+        if reference_data is None:
+            if not len(self._dc):
+                return []
+            reference_data = self._dc[0]
+        existing_links = None
+        new_links = []
+        for data in datasets:
+            if data is reference_data:
+                continue
+            key = (reference_data.uuid, data.uuid)
+            link = self._links.get(key)
+            if link is not None:
+                # links are removed by glue along with their data (e.g. if data were removed and
+                # then added again), so check that the link is still in the data collection
+                if existing_links is None:
+                    existing_links = {id(link) for link in self._dc.external_links}
+                if id(link) in existing_links:
+                    continue
+            link = LinkSame(cid1=reference_data.world_component_ids[0],
+                            cid2=data.world_component_ids[0],
+                            data1=reference_data,
+                            data2=data,
+                            labels1=reference_data.label,
+                            labels2=data.label)
+            self._links[key] = link
+            new_links.append(link)
+        if len(new_links):
+            # a single update of the link manager for all new links
+            self._dc.add_link(new_links)
+        return new_links
+
+
+def _parallel_map(func, items, max_workers=None):
+    """
+    Apply ``func`` to each entry in ``items`` in a bounded thread pool.
+
+    Parameters
+    ----------
+    func : callable
+        Function to apply to each item.
+    items : iterable
+        Inputs to ``func``.
+    max_workers : int, optional
+        Maximum number of worker threads.  Defaults to the number of CPUs.
+
+    Returns
+    -------
+    results : list
+        Output of ``func`` for each item, in the same order as ``items``.
+    """
+    items = list(items)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(items))
+    if max_workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, items))
+
+
+def _bls_search(lc, **kwargs):
+    """
+    Validate the inputs and apply the defaults of
+    ``lightkurve.periodogram.BoxLeastSquaresPeriodogram.from_lightcurve``.
+
+    Returns
+    -------
+    lc : `~lightkurve.LightCurve`
+        ``lc`` without NaNs.
+    bls : `~astropy.timeseries.BoxLeastSquares`
+    period : `~astropy.units.Quantity`
+        Trial periods (either as passed or the default grid from ``bls.autoperiod``).
+    duration : array-like
+        Trial durations.
+    time_unit : str
+    kwargs : dict
+        Remaining options, to pass to ``bls.power``.
+    """
+    lc = lc.remove_nans()
+    dy = lc.flux_err if np.isfinite(lc.flux_err).all() else None
+
+    duration = kwargs.pop("duration", [0.05, 0.10, 0.15, 0.20, 0.25, 0.33])
+    if duration is not None and ~np.all(np.isfinite(duration)):
+        raise ValueError("`duration` parameter contains illegal nan or inf value(s)")
+
+    period = kwargs.pop("period", None)
+    minimum_period = kwargs.pop("minimum_period", None)
+    maximum_period = kwargs.pop("maximum_period", None)
+    if period is not None and ~np.all(np.isfinite(period)):
+        raise ValueError("`period` parameter contains illegal nan or inf value(s)")
+    time = lc.time.value
+    if minimum_period is None:
+        if period is None:
+            minimum_period = np.max([np.median(np.diff(time)) * 4,
+                                     np.max(duration) + np.median(np.diff(time))])
+        else:
+            minimum_period = np.min(period)
+    if maximum_period is None:
+        if period is None:
+            maximum_period = (np.max(time) - np.min(time)) / 3.0
+        else:
+            maximum_period = np.max(period)
+
+    time_unit = kwargs.pop("time_unit", "day")
+    if time_unit not in dir(u):
+        raise ValueError(f"{time_unit} is not a valid value for `time_unit`")
+
+    frequency_factor = kwargs.pop("frequency_factor", 10)
+    df = frequency_factor * np.min(duration) / (np.max(time) - np.min(time)) ** 2
+    npoints = int(((1 / minimum_period) - (1 / maximum_period)) / df)
+    if npoints > 1e7:
+        raise ValueError(f"`period` contains {npoints} points. "
+                         "Periodogram is too large to evaluate. "
+                         "Consider setting `frequency_factor` to a higher value.")
+
+    bls = BoxLeastSquares(lc.time, lc.flux, dy)
+    if period is None:
+        period = bls.autoperiod(duration,
+                                minimum_period=minimum_period,
+                                maximum_period=maximum_period,
+                                frequency_factor=frequency_factor)
+    return lc, bls, period, duration, time_unit, kwargs
+
+
+def _bls_periodogram_from_result(lc, bls, result, time_unit):
+    # as constructed by BoxLeastSquaresPeriodogram.from_lightcurve
+    if not isinstance(result.period, u.Quantity):
+        result.period = u.Quantity(result.period, time_unit)
+    if not isinstance(result.power, u.Quantity):
+        result.power = result.power * u.dimensionless_unscaled
+    if not isinstance(result.duration, u.Quantity):
+        result.duration = u.Quantity(result.duration, time_unit)
+
+    return periodogram.BoxLeastSquaresPeriodogram(
+        frequency=1.0 / result.period,
+        power=result.power,
+        default_view="period",
+        label=lc.meta.get("LABEL"),
+        targetid=lc.meta.get("TARGETID"),
+        transit_time=result.transit_time,
+        duration=result.duration,
+        depth=result.depth,
+        bls_result=result,
+        snr=result.depth_snr,
+        bls_obj=bls,
+        time=lc.time,
+        flux=lc.flux,
+        time_unit=time_unit,
+    )
+
+
+def _concatenate_bls_results(results, order=None):
+    """
+    Concatenate the arrays of several ``BoxLeastSquaresResults``, optionally re-ordered by
+    ``order`` (indices into the concatenated arrays).
+    """
+    fields = ('period', 'power', 'depth', 'depth_err', 'duration',
+              'transit_time', 'depth_snr', 'log_likelihood')
+    arrays = [np.concatenate([result[k] for result in results]) for k in fields]
+    if order is not None:
+        arrays = [arr[order] for arr in arrays]
+    return BoxLeastSquaresResults(results[0].objective, *arrays)
+
+
+def _bls_periodogram(lc, max_workers=None, chunks_per_worker=4, **kwargs):
+    """
+    Box Least Squares periodogram of ``lc``, equivalent to
+    ``lightkurve.periodogram.BoxLeastSquaresPeriodogram.from_lightcurve(lc, **kwargs)``, but
+    evaluating chunks of the period grid concurrently.
+
+    The power at each trial period is independent of all other periods and the compiled
+    implementation in astropy releases the GIL, so the chunks are evaluated in a thread pool
+    (sharing the light curve arrays between workers) and their results concatenated, giving results
+    identical to the serial implementation.
+
+    Parameters
+    ----------
+    lc : `~lightkurve.LightCurve`
+        Light curve from which to compute the periodogram.
+    max_workers : int, optional
+        Maximum number of worker threads.  Defaults to the number of CPUs.
+    chunks_per_worker : int, optional
+        Number of chunks of the period grid per worker, to balance the load between workers
+        (longer trial periods are more expensive to evaluate).
+    kwargs : dict
+        Passed to ``from_lightcurve`` (e.g. ``duration``, ``minimum_period``, ``maximum_period``).
+
+    Returns
+    -------
+    periodogram : `~lightkurve.periodogram.BoxLeastSquaresPeriodogram`
+    """
+    lc, bls, period, duration, time_unit, kwargs = _bls_search(lc, **kwargs)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    n_chunks = min(max_workers * chunks_per_worker, len(period)) if max_workers > 1 else 1
+    if n_chunks > 1:
+        chunks = _parallel_map(lambda chunk: bls.power(chunk, duration, **kwargs),
+                               np.array_split(period, n_chunks),
+                               max_workers=max_workers)
+        result = _concatenate_bls_results(chunks)
+    else:
+        result = bls.power(period, duration, **kwargs)
+
+    return _bls_periodogram_from_result(lc, bls, result, time_unit)
+
+
+def _ls_frequency_grid(lc, minimum_period=None, maximum_period=None,
+                       oversample_factor=5.0, nyquist_factor=1):
+    """
+    Default (amplitude-normalized) frequency grid, in 1/d, of
+    ``lightkurve.periodogram.LombScarglePeriodogram.from_lightcurve``, as ``(f0, df, n)`` for the
+    frequencies ``f0 + df * arange(n)``.
+    """
+    time = lc.time.value
+    nyquist = 0.5 / np.median(np.diff(time))
+    fs = (1.0 / (time[-1] - time[0])) / oversample_factor
+    minimum_frequency = fs if maximum_period is None else 1.0 / maximum_period
+    maximum_frequency = nyquist * nyquist_factor if minimum_period is None else 1.0 / minimum_period
+    if minimum_frequency > maximum_frequency:
+        raise ValueError("minimum_period cannot be larger than maximum_period")
+    # same length as np.arange(minimum_frequency, maximum_frequency, fs)
+    return minimum_frequency, fs, int(np.ceil((maximum_frequency - minimum_frequency) / fs))
+
+
+def _nufft_trig_sum(t, values, f0, df, n, n_spread=12):
+    """
+    Trigonometric sums ``sum_j values[i, j] * exp(2 pi i f_k t_j)`` over the uniform frequency grid
+    ``f_k = f0 + k * df`` (``k = 0 ... n - 1``), for each row of ``values``, using a type-1
+    non-uniform FFT with Gaussian gridding (Greengard & Lee 2004, SIAM Review 46, 443) on a 2x
+    oversampled grid, in O(N * n_spread + n log n).
+
+    The spreading kernel only depends on ``t`` (not on ``values``), so all rows are spread
+    together.  With ``n_spread=12``, the relative error is ~1e-12.
+
+    Returns
+    -------
+    sums : ndarray
+        Complex array of shape ``(len(values), n)``.
+    """
+    values = np.atleast_2d(values)
+    t_min = t.min()
+    t = t - t_min
+    n_modes = n + n % 2
+    n_grid = 2 * n_modes
+    # Gaussian width for a 2x oversampled grid (Greengard & Lee 2004, eq. 9)
+    tau = np.pi * n_spread / (n_modes ** 2 * 2 * 1.5)
+
+    # modes k' = k - n_modes / 2 (centered on zero), at positions x in [0, 2 pi)
+    f_center = f0 + df * (n_modes // 2)
+    x = (2 * np.pi * df * t) % (2 * np.pi)
+    spread_values = values * np.exp(2j * np.pi * f_center * t)
+    grid_spacing = 2 * np.pi / n_grid
+    nearest = np.floor(x / grid_spacing).astype(np.int64)
+    grid = np.zeros((len(values), n_grid), dtype=complex)
+    for offset in range(-n_spread + 1, n_spread + 1):
+        inds = nearest + offset
+        kernel = np.exp(-(x - inds * grid_spacing) ** 2 / (4 * tau))
+        inds %= n_grid
+        for row, row_values in zip(grid, spread_values * kernel):
+            row += (np.bincount(inds, row_values.real, minlength=n_grid)
+                    + 1j * np.bincount(inds, row_values.imag, minlength=n_grid))
+
+    modes = np.arange(n) - n_modes // 2
+    sums = np.fft.ifft(grid, axis=1)[:, modes % n_grid]
+    # deconvolve the Gaussian kernel and undo the shift of the times
+    return sums * (np.sqrt(np.pi / tau) * np.exp(modes ** 2 * tau)
+                   * np.exp(2j * np.pi * (f0 + df * np.arange(n)) * t_min))
+
+
+def _lombscargle_nufft_window(t, f0, df, n, dy=None, n_spread=12):
+    """
+    Trigonometric sums of the weights in `_lombscargle_nufft`, which only depend on the times and
+    uncertainties, so that they can be re-used for several fluxes at the same times (e.g. the
+    residuals when prewhitening).
+    """
+    dy = np.ones_like(t) if dy is None else np.broadcast_to(dy, t.shape)
+    w = dy ** -2.0
+    w /= w.sum()
+    return (w,
+            _nufft_trig_sum(t, w, f0, df, n, n_spread)[0],
+            _nufft_trig_sum(t, w, 2 * f0, 2 * df, n, n_spread)[0])
+
+
+def _lombscargle_nufft(t, y, f0, df, n, dy=None, n_spread=12, window=None):
+    """
+    Floating-mean Lomb-Scargle power (with "psd" normalization) over the frequency grid
+    ``f0 + df * arange(n)``, following the same expressions as the fast method in astropy
+    (``astropy.timeseries.LombScargle.power(method='fast')``), but computing the trigonometric
+    sums with `_nufft_trig_sum`.  Gaps in ``t`` need no special treatment (or resampling).
+
+    ``window`` can be passed from `_lombscargle_nufft_window` (for the same ``t``, grid, and
+    ``dy``), in which case only the sums of ``y`` are computed.
+    """
+    dy = np.ones_like(y) if dy is None else np.broadcast_to(dy, y.shape)
+    # Sh, Ch: sums of w * y; S, C: sums of w (both at f); S2, C2: sums of w at 2 f
+    if window is None:
+        w = dy ** -2.0
+        w /= w.sum()
+        y = y - np.dot(w, y)
+        sum_wy, sum_w = _nufft_trig_sum(t, np.array([w * y, w]), f0, df, n, n_spread)
+        sum_w2 = _nufft_trig_sum(t, w, 2 * f0, 2 * df, n, n_spread)[0]
+    else:
+        w, sum_w, sum_w2 = window
+        y = y - np.dot(w, y)
+        sum_wy = _nufft_trig_sum(t, w * y, f0, df, n, n_spread)[0]
+    Sh, Ch = sum_wy.imag, sum_wy.real
+    S, C = sum_w.imag, sum_w.real
+    S2, C2 = sum_w2.imag, sum_w2.real
+
+    tan_2omega_tau = (S2 - 2 * S * C) / (C2 - (C * C - S * S))
+    S2w = tan_2omega_tau / np.sqrt(1 + tan_2omega_tau * tan_2omega_tau)
+    C2w = 1 / np.sqrt(1 + tan_2omega_tau * tan_2omega_tau)
+    Cw = np.sqrt(0.5) * np.sqrt(1 + C2w)
+    Sw = np.sqrt(0.5) * np.sign(S2w) * np.sqrt(1 - C2w)
+
+    YC = Ch * Cw + Sh * Sw
+    YS = Sh * Cw - Ch * Sw
+    CC = 0.5 * (1 + C2 * C2w + S2 * S2w) - (C * Cw + S * Sw) ** 2
+    SS = 0.5 * (1 - C2 * C2w - S2 * S2w) - (S * Cw - C * Sw) ** 2
+    return (YC * YC / CC + YS * YS / SS) * 0.5 * (dy ** -2.0).sum()
+
+
+def _nufft_ls_periodogram(lc, **kwargs):
+    """
+    Lomb-Scargle periodogram of ``lc``, equivalent to
+    ``lightkurve.periodogram.LombScarglePeriodogram.from_lightcurve(lc, **kwargs)`` (with the
+    default amplitude normalization and frequency grid), but computed with `_lombscargle_nufft`.
+    Only ``minimum_period``, ``maximum_period``, ``oversample_factor``, and ``nyquist_factor``
+    are supported in ``kwargs``.
+    """
+    lc = lc.remove_nans()
+    default_view = 'frequency' if kwargs.get('minimum_period') is None and \
+        kwargs.get('maximum_period') is None else 'period'
+    return _nufft_ls_on_grid(lc, *_ls_frequency_grid(lc, **kwargs), default_view=default_view)
+
+
+def _nufft_ls_on_grid(lc, f0, df, n, default_view='frequency'):
+    # amplitude-normalized, as in LombScarglePeriodogram.from_lightcurve, for lc without NaNs
+    time = lc.time.value
+    flux = np.asarray(getattr(lc.flux, 'unmasked', lc.flux).value, dtype=float)
+    psd = _lombscargle_nufft(time, flux, f0, df, n)
+    return periodogram.LombScarglePeriodogram(
+        frequency=u.Quantity(f0 + df * np.arange(n), 1 / u.d),
+        power=np.sqrt(psd) * np.sqrt(4.0 / len(time)) * lc.flux.unit,
+        nyquist=0.5 / np.median(np.diff(time)) / u.d,
+        targetid=lc.meta.get("TARGETID"),
+        label=lc.meta.get("LABEL"),
+        default_view=default_view,
+        # for the model and statistics of the periodogram (the power is not computed by astropy)
+        ls_obj=LombScargle(lc.time, lc.flux, nterms=1, normalization="psd"),
+        nterms=1,
+        ls_method="fast",
+        meta=lc.meta)
+
+
+def _sinusoids_design_matrix(t, frequencies):
+    """
+    Design matrix of a constant plus a cosine and a sine at each of ``frequencies``, with columns
+    ``[1, cos(2 pi f_0 t), sin(2 pi f_0 t), cos(2 pi f_1 t), ...]``.
+    """
+    arg = 2 * np.pi * np.outer(t, frequencies)
+    design = np.empty((len(t), 1 + 2 * len(frequencies)))
+    design[:, 0] = 1
+    design[:, 1::2] = np.cos(arg)
+    design[:, 2::2] = np.sin(arg)
+    return design
+
+
+def _fit_sinusoids(t, y, frequencies, n_iter=10, rtol=1e-10):
+    """
+    Jointly fit a constant and a sinusoid at each of ``frequencies`` (as initial guesses) to
+    ``y``, by Gauss-Newton iterations in which the amplitudes and frequency corrections are solved
+    by linear least squares.
+
+    Returns the refined frequencies and the coefficients of `_sinusoids_design_matrix`.
+    """
+    frequencies = np.array(frequencies, dtype=float)
+    # relative to the center of the light curve, so that frequencies and phases are not degenerate
+    t_ref = 0.5 * (t.min() + t.max())
+    tc = t - t_ref
+    for _ in range(n_iter):
+        design = _sinusoids_design_matrix(tc, frequencies)
+        coeffs = np.linalg.lstsq(design, y, rcond=None)[0]
+        # derivatives of the model with respect to each frequency
+        jacobian = 2 * np.pi * tc[:, None] * (coeffs[2::2] * design[:, 1::2]
+                                              - coeffs[1::2] * design[:, 2::2])
+        step = np.linalg.lstsq(np.hstack([design, jacobian]), y - design @ coeffs,
+                               rcond=None)[0][design.shape[1]:]
+        frequencies += step
+        if np.all(np.abs(step) <= rtol * np.abs(frequencies)):
+            break
+    # amplitudes at the refined frequencies, for the original times
+    return frequencies, np.linalg.lstsq(_sinusoids_design_matrix(t, frequencies), y,
+                                        rcond=None)[0]
+
+
+def _prewhiten(lc, n_frequencies, **kwargs):
+    """
+    Iteratively extract ``n_frequencies`` sinusoids from ``lc`` ("prewhitening"): take the highest
+    peak of the (amplitude-normalized) Lomb-Scargle periodogram of the residuals, refit all
+    extracted sinusoids (and a constant) jointly with `_fit_sinusoids`, and repeat with the new
+    residuals.
+
+    The periodogram of the residuals is computed with `_lombscargle_nufft` on the grid of
+    `_ls_frequency_grid` (``kwargs`` are passed to it), re-using the sums of the window (which do
+    not depend on the flux) at each step.
+
+    Returns
+    -------
+    frequencies : ndarray
+        Extracted frequencies, in 1/d, in the order of extraction.
+    coeffs : ndarray
+        Least squares coefficients of `_sinusoids_design_matrix` (for the times in
+        ``lc.time.value``) at ``frequencies``.
+    peak_power : ndarray
+        Periodogram power (amplitude, in the units of the flux) of the residuals at each peak when
+        it was extracted.
+    """
+    lc = lc.remove_nans()
+    t = lc.time.value
+    y = np.asarray(getattr(lc.flux, 'unmasked', lc.flux).value, dtype=float)
+    f0, df, n = _ls_frequency_grid(lc, **kwargs)
+    window = _lombscargle_nufft_window(t, f0, df, n)
+    norm = np.sqrt(4.0 / len(t))
+
+    frequencies, peak_power = np.array([]), []
+    coeffs, residual = np.array([np.mean(y)]), y - np.mean(y)
+    for _ in range(n_frequencies):
+        power = np.sqrt(np.clip(_lombscargle_nufft(t, residual, f0, df, n, window=window),
+                                0, None)) * norm
+        k = int(np.nanargmax(power))
+        peak_power.append(power[k])
+        frequencies, coeffs = _fit_sinusoids(t, y, np.append(frequencies, f0 + df * k))
+        residual = y - _sinusoids_design_matrix(t, frequencies) @ coeffs
+
+    return frequencies, coeffs, np.array(peak_power)
+
+
+def _top_peaks(power, top_k):
+    """
+    Indices of the (up to) ``top_k`` highest local maxima of ``power``.
+    """
+    power = np.nan_to_num(np.asarray(power, dtype=float), nan=-np.inf)
+    padded = np.concatenate([[-np.inf], power, [-np.inf]])
+    peaks = np.flatnonzero((padded[1:-1] >= padded[:-2]) & (padded[1:-1] >= padded[2:]))
+    return peaks[np.argsort(power[peaks])[::-1][:top_k]]
+
+
+def _minmax_decimate(x, y, n_bins, x_min=None, x_max=None):
+    """
+    Indices (sorted) of a min/max envelope of ``y`` against a monotonic ``x``, for display at a
+    resolution of ``n_bins`` equal-width bins of ``x`` between ``x_min`` and ``x_max`` (defaulting
+    to the full range of ``x``).
+
+    The samples with the minimum and maximum ``y`` in each bin are kept, so no peak is lost at
+    that resolution, along with the samples just outside the range (so that lines extend to its
+    edges) and the first and last samples.  At most ``2 * n_bins + 4`` indices are returned.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= 2 * n_bins + 4:
+        return np.arange(n)
+    x_min = np.nanmin(x) if x_min is None else x_min
+    x_max = np.nanmax(x) if x_max is None else x_max
+
+    # contiguous since x is monotonic (e.g. increasing frequency or decreasing period)
+    inds = np.flatnonzero((x >= x_min) & (x <= x_max))
+    keep = [[0, n - 1]]
+    if len(inds):
+        keep.append([max(inds[0] - 1, 0), min(inds[-1] + 1, n - 1)])
+    if len(inds) <= 2 * n_bins:
+        keep.append(inds)
+    else:
+        bins = np.clip(((x[inds] - x_min) / (x_max - x_min) * n_bins).astype(int), 0, n_bins - 1)
+        # each bin is a contiguous run of samples
+        starts = np.flatnonzero(np.diff(bins, prepend=bins[0] - 1))
+        counts = np.diff(np.append(starts, len(inds)))
+        positions = np.arange(len(inds))
+        for func, fill in ((np.maximum, -np.inf), (np.minimum, np.inf)):
+            values = np.where(np.isnan(y[inds]), fill, y[inds])
+            extreme = func.reduceat(values, starts)
+            # first sample in each bin at the extreme value (or len(inds) if all are nan)
+            first = np.minimum.reduceat(np.where(values == np.repeat(extreme, counts),
+                                                 positions, len(inds)), starts)
+            keep.append(inds[first[first < len(inds)]])
+    return np.unique(np.concatenate(keep))
+
+
+def _adaptive_periodogram(lc, method, coarse_factor=10, top_k=10, **kwargs):
+    """
+    Periodogram of ``lc`` from a coarse-to-fine search: the power is evaluated on every
+    ``coarse_factor``-th entry of the default (dense) grid, and then on the full-resolution
+    grid only in the neighborhoods of the ``top_k`` highest peaks of the coarse periodogram.
+
+    The returned periodogram is evaluated on the union of the coarse and refined grids (so
+    is not uniformly sampled), and its peaks match those of the dense periodogram whenever
+    they are among the ``top_k`` highest peaks of the coarse periodogram.
+
+    Parameters
+    ----------
+    lc : `~lightkurve.LightCurve`
+        Light curve from which to compute the periodogram.
+    method : str
+        'Lomb-Scargle', 'Lomb-Scargle (NUFFT)', or 'Box Least Squares'.
+    coarse_factor : int, optional
+        Ratio of the spacing of the coarse grid to the spacing of the dense grid.
+    top_k : int, optional
+        Number of peaks of the coarse periodogram to refine.
+    kwargs : dict
+        Passed to ``from_lightcurve``.  For Lomb-Scargle, only ``minimum_period``,
+        ``maximum_period``, ``oversample_factor``, and ``nyquist_factor`` are supported.
+
+    Returns
+    -------
+    periodogram : `~lightkurve.periodogram.Periodogram`
+    """
+    if method in ('Lomb-Scargle', 'Lomb-Scargle (NUFFT)'):
+        default_view = 'frequency' if kwargs.get('minimum_period') is None and \
+            kwargs.get('maximum_period') is None else 'period'
+        if method == 'Lomb-Scargle (NUFFT)':
+            lc = lc.remove_nans()
+        f0, df, n = _ls_frequency_grid(lc, **kwargs)
+        grid = f0 + df * np.arange(n)
+
+        def evaluate(inds):
+            if isinstance(inds, slice) and method == 'Lomb-Scargle (NUFFT)':
+                start, _, step = inds.indices(n)
+                return _nufft_ls_on_grid(lc, grid[start], df * step, len(grid[inds]))
+            # the fast (FFT-based) method requires a regular grid, the (irregular) refined
+            # grid is instead evaluated directly, which costs O(N) per frequency
+            return periodogram.LombScarglePeriodogram.from_lightcurve(
+                lc, frequency=grid[inds], freq_unit=1 / u.d,
+                ls_method='fast' if isinstance(inds, slice) else 'cython')
+    elif method == 'Box Least Squares':
+        lc, _, grid, duration, time_unit, kwargs = _bls_search(lc, **kwargs)
+        grid = getattr(grid, 'value', grid)
+
+        def evaluate(inds):
+            return _bls_periodogram(lc, period=grid[inds], duration=duration,
+                                    time_unit=time_unit, **kwargs)
+    else:
+        raise NotImplementedError(f"periodogram not implemented for {method}")
+
+    n = len(grid)
+    if coarse_factor < 2 or n < 3 * coarse_factor * top_k:
+        # the refined neighborhoods would cover most of the grid
+        per = evaluate(slice(None))
+        if method != 'Box Least Squares':
+            per.default_view = default_view
+        return per
+
+    coarse_inds = np.arange(0, n, coarse_factor)
+    coarse = evaluate(slice(None, None, coarse_factor))
+    # full-resolution neighborhoods (up to the adjacent coarse samples) of each peak
+    refine = np.zeros(n, dtype=bool)
+    for peak in coarse_inds[_top_peaks(coarse.power.value, top_k)]:
+        refine[max(peak - coarse_factor, 0):peak + coarse_factor + 1] = True
+    refine_inds = np.flatnonzero(refine)
+    refined = evaluate(refine_inds)
+
+    # coarse samples outside the refined neighborhoods, followed by the refined samples
+    keep = np.flatnonzero(~refine[coarse_inds])
+    order = np.argsort(np.concatenate([coarse_inds[keep], refine_inds]), kind='stable')
+    if method == 'Box Least Squares':
+        result = _concatenate_bls_results([coarse._BLS_result, refined._BLS_result])
+        # indices into the concatenated arrays, skipping the coarse samples that were refined
+        positions = np.concatenate([keep, len(coarse_inds) + np.arange(len(refine_inds))])
+        result = _concatenate_bls_results([result], order=positions[order])
+        return _bls_periodogram_from_result(lc, coarse._BLS_object, result, time_unit)
+
+    frequency = np.concatenate([coarse.frequency[keep], refined.frequency])
+    power = np.concatenate([coarse.power[keep], refined.power])
+    return periodogram.LombScarglePeriodogram(
+        frequency=frequency[order],
+        power=power[order],
+        nyquist=coarse.nyquist,
+        targetid=coarse.targetid,
+        label=coarse.label,
+        default_view=default_view,
+        ls_obj=coarse._LS_object,
+        nterms=coarse.nterms,
+        ls_method=coarse.ls_method,
+        meta=coarse.meta)
+
+
+class _DiskCache:
+    """
+    Persistent cache of picklable objects, with one file per entry on disk and an in-memory layer
+    so that repeated lookups within a session do not need to re-read the file.
+
+    Parameters
+    ----------
+    name : str
+        Name of the cache, used as the subdirectory within ``cache_dir``.
+    ttl : float, optional
+        Time-to-live of entries, in seconds.  Expired entries are ignored by ``get`` (unless
+        ``ignore_ttl=True``).  If not provided, entries never expire.
+    cache_dir : str, optional
+        Parent directory of the cache.  Defaults to the lcviz subdirectory of the astropy cache
+        directory.
+    """
+    def __init__(self, name, ttl=None, cache_dir=None):
+        self.name = name
+        self.ttl = ttl
+        self._cache_dir = cache_dir
+        self._memory = {}
+
+    @property
+    def cache_dir(self):
+        if self._cache_dir is None:
+            from astropy.config import get_cache_dir_path
+            return get_cache_dir_path('lcviz') / self.name
+        return Path(self._cache_dir) / self.name
+
+    def _path(self, key):
+        return self.cache_dir / f"{hashlib.sha256(repr(key).encode()).hexdigest()}.pkl"
+
+    def get(self, key, default=None, ignore_ttl=False):
+        """
+        Retrieve the value stored for ``key``, or ``default`` if there is no (unexpired) entry.
+        """
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    entry = pickle.load(f)
+            except Exception:
+                # missing or unreadable (e.g. written by an incompatible version) entry
+                return default
+            self._memory[key] = entry
+        timestamp, value = entry
+        if not ignore_ttl and self.ttl is not None and time.time() - timestamp > self.ttl:
+            return default
+        return value
+
+    def set(self, key, value):
+        """
+        Store ``value`` for ``key``, both in memory and on disk.
+        """
+        entry = (time.time(), value)
+        self._memory[key] = entry
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:  # pragma: no cover
+            # read-only or full disk, entry is still cached for this session
+            pass
+
+    def clear(self):
+        """
+        Remove all entries, both in memory and on disk.
+        """
+        self._memory = {}
+        for path in self.cache_dir.glob('*.pkl'):
+            path.unlink(missing_ok=True)
+
+
+class _CoalescedCall:
+    """
+    Coalesce bursts of calls into a single call of ``func``, leaving at least ``interval`` seconds
+    between the end of one call and the start of the next.  Calls are scheduled on the running
+    event loop (e.g. the kernel's, while handling messages from the front-end), so any calls made
+    before the scheduled call runs are merged into it.  Without a running event loop, ``func`` is
+    called immediately.
+
+    Parameters
+    ----------
+    func : callable
+        Function to call, without arguments.  Any state it needs (e.g. which entries are out of
+        date) should be tracked by the caller, so that the scheduled call uses the latest values.
+    interval : float, optional
+        Minimum time between calls, in seconds.  Defaults to 1/30 (i.e. a target frame rate of 30
+        updates per second).
+    """
+    def __init__(self, func, interval=1/30):
+        self._func = func
+        self.interval = interval
+        self._handle = None
+        self._last_call = -np.inf
+
+    @property
+    def pending(self):
+        return self._handle is not None
+
+    def __call__(self):
+        if self._handle is not None:
+            # already scheduled, will be handled by the scheduled call
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush(force=True)
+            return
+        delay = max(0, self._last_call + self.interval - time.monotonic())
+        self._handle = loop.call_later(delay, self.flush)
+
+    def cancel(self):
+        """
+        Cancel the scheduled call, if any.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def flush(self, force=False):
+        """
+        Make the scheduled call now, if any (or regardless if ``force=True``).
+        """
+        if self._handle is None and not force:
+            return
+        self.cancel()
+        try:
+            self._func()
+        finally:
+            # measured from the end of the call, so that calls slower than the interval still
+            # leave time to coalesce the requests that arrived in the meantime
+            self._last_call = time.monotonic()
+
+
+class _PeriodogramCache:
+    """
+    In-memory cache of lightkurve periodograms shared by all plugins (e.g. Ephemeris and Frequency
+    Analysis), keyed by the content of the light curve and the periodogram options, and evicting
+    the least recently used entries once the cached periodograms exceed ``max_bytes``.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Approximate memory cap of the cached periodograms.
+    """
+    methods = {'Lomb-Scargle': periodogram.LombScarglePeriodogram,
+               'Lomb-Scargle (NUFFT)': periodogram.LombScarglePeriodogram,
+               'Box Least Squares': periodogram.BoxLeastSquaresPeriodogram}
+
+    def __init__(self, max_bytes=256 * 1024**2):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key: (periodogram, nbytes)
+        self._nbytes = 0
+        # periodograms may be requested from background threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _content_key(lc):
+        digest = hashlib.blake2b(digest_size=16)
+        for col in (lc.time.value, lc.flux, lc.flux_err):
+            # values and mask (if any) of masked columns
+            for arr in (getattr(col, 'unmasked', col), getattr(col, 'mask', None)):
+                if arr is not None:
+                    digest.update(np.ascontiguousarray(getattr(arr, 'value', arr)).view(np.uint8))
+        return digest.hexdigest(), str(lc.flux.unit)
+
+    @staticmethod
+    def _nbytes_of(per):
+        # the arrays of the periodogram and of its (astropy) model object, if any
+        nbytes = 0
+        for value in vars(per).values():
+            nbytes += getattr(value, 'nbytes', 0)
+            if hasattr(value, '__dict__') and not isinstance(value, np.ndarray):
+                nbytes += sum(getattr(v, 'nbytes', 0) for v in vars(value).values())
+        return nbytes
+
+    def get(self, lc, method, grid='uniform', **kwargs):
+        """
+        Retrieve the periodogram of ``lc`` for ``method`` ('Lomb-Scargle', 'Lomb-Scargle (NUFFT)',
+        or 'Box Least Squares'), computing it (with ``kwargs`` passed to ``from_lightcurve``) if
+        not cached.  Options that are `None` are treated as not provided.  With
+        ``grid='adaptive'``, the periodogram is computed from a coarse-to-fine search (see
+        ``_adaptive_periodogram``).
+        """
+        if method not in self.methods:
+            raise NotImplementedError(f"periodogram not implemented for {method}")
+        if grid not in ('uniform', 'adaptive'):
+            raise ValueError(f"grid must be 'uniform' or 'adaptive', not {grid}")
+        kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        key = (self._content_key(lc), method, grid, tuple(sorted(kwargs.items())))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+
+        if grid == 'adaptive':
+            per = _adaptive_periodogram(lc, method, **kwargs)
+        elif method == 'Box Least Squares':
+            # evaluated over chunks of the period grid concurrently
+            per = _bls_periodogram(lc, **kwargs)
+        elif method == 'Lomb-Scargle (NUFFT)':
+            per = _nufft_ls_periodogram(lc, **kwargs)
+        else:
+            per = self.methods[method].from_lightcurve(lc, **kwargs)
+        nbytes = self._nbytes_of(per)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (per, nbytes)
+                self._nbytes += nbytes
+            while self._nbytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_nbytes
+        return per
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+
+_periodogram_cache = _PeriodogramCache()
+
+
+# statistics supported by _bin_light_curve
+_BIN_STATISTICS = ('mean', 'weighted mean', 'median')
+
+
+def _bin_sums(bin_index, n_bins, flux, flux_err, ref=0.):
+    """
+    Per-bin sums needed by `_bin_statistics`, for the samples assigned to ``bin_index`` (between
+    0 and ``n_bins - 1``) with finite flux.  Fluxes are summed relative to ``ref`` (e.g. the mean
+    flux) to avoid cancellation in the variance.
+    """
+    dflux = flux - ref
+    valid_err = np.isfinite(flux_err) & (flux_err > 0)
+    weights = np.where(valid_err, flux_err, np.inf) ** -2.0
+    flux_err = np.where(valid_err, flux_err, 0)
+
+    def bin_sum(values=None):
+        return np.bincount(bin_index, values, minlength=n_bins)
+
+    return {'n': bin_sum(),
+            'flux': bin_sum(dflux),
+            'flux2': bin_sum(dflux ** 2),
+            'n_err': bin_sum(valid_err.astype(float)),
+            'err2': bin_sum(flux_err ** 2),
+            'weight': bin_sum(weights),
+            'weighted_flux': bin_sum(weights * dflux)}
+
+
+def _bin_statistics(sums, statistic='mean', ref=0., median=None):
+    """
+    Binned flux and uncertainty from the per-bin sums of `_bin_sums`:
+
+    * ``'mean'``: the uncertainty is propagated from ``flux_err`` (``sqrt(sum(err**2)) / n``), or
+      is the standard error of the mean if no bin has uncertainties.
+    * ``'weighted mean'``: inverse-variance weighted mean, with an uncertainty of
+      ``1 / sqrt(sum(1 / err**2))``.
+    * ``'median'``: ``median`` (computed by the caller), with the uncertainty of the mean
+      scaled by ``sqrt(pi / 2)`` (the asymptotic efficiency of the median for Gaussian noise).
+
+    Empty bins are NaN.
+    """
+    if statistic not in _BIN_STATISTICS:
+        raise ValueError(f"statistic must be one of {_BIN_STATISTICS}, not '{statistic}'")
+    with np.errstate(invalid='ignore', divide='ignore'):
+        n = sums['n']
+        if statistic == 'weighted mean':
+            if not np.any(sums['n_err']):
+                raise ValueError("weighted mean requires flux uncertainties")
+            flux = ref + sums['weighted_flux'] / sums['weight']
+            flux_err = sums['weight'] ** -0.5
+            return flux, flux_err
+
+        flux = ref + sums['flux'] / n if median is None else median
+        if np.any(sums['n_err']):
+            flux_err = np.sqrt(sums['err2']) / sums['n_err']
+        else:
+            variance = (sums['flux2'] - sums['flux'] ** 2 / n) / (n - 1)
+            flux_err = np.sqrt(np.clip(variance, 0, None) / n)
+        if statistic == 'median':
+            flux_err = flux_err * np.sqrt(np.pi / 2)
+        return flux, flux_err
+
+
+def _binned_median(bin_index, n_bins, flux):
+    """
+    Median of ``flux`` in each bin (NaN for empty bins), by sorting the samples by bin and flux.
+    """
+    order = np.lexsort((flux, bin_index))
+    sorted_flux = flux[order]
+    counts = np.bincount(bin_index, minlength=n_bins)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    nonempty = counts > 0
+    lower = starts[nonempty] + (counts[nonempty] - 1) // 2
+    upper = starts[nonempty] + counts[nonempty] // 2
+    median = np.full(n_bins, np.nan)
+    median[nonempty] = 0.5 * (sorted_flux[lower] + sorted_flux[upper])
+    return median
+
+
+def _bin_inputs(lc):
+    """
+    Time (or phase, for a folded light curve) values, flux, and flux uncertainty (in the units of
+    the flux) of ``lc`` as float arrays, with masked values as NaN.
+    """
+    x = np.asarray(lc.time.value, dtype=float)
+    flux, flux_err = lc.flux, lc.flux_err
+    if hasattr(flux, 'mask'):
+        flux = flux.filled(np.nan)
+    if hasattr(flux_err, 'mask'):
+        flux_err = flux_err.filled(np.nan)
+    return (x, np.asarray(flux.value, dtype=float),
+            np.asarray(flux_err.to_value(lc.flux.unit), dtype=float))
+
+
+def _bin_edges(x_start, x_stop, n_bins):
+    n_bins = int(n_bins)
+    if n_bins <= 0:
+        raise ValueError("n_bins must be a positive integer")
+    return x_start + (x_stop - x_start) / n_bins * np.arange(n_bins + 1)
+
+
+def _binned_light_curve(template, edges, flux, flux_err):
+    """
+    Light curve of the same class as ``template`` with the time at the center of each bin.
+    """
+    time = template.time.__class__(0.5 * (edges[:-1] + edges[1:]),
+                                   format=template.time.format, scale=template.time.scale)
+    return template.__class__(time=time,
+                              flux=flux * template.flux.unit,
+                              flux_err=flux_err * template.flux.unit,
+                              meta=template.meta)
+
+
+def _bin_light_curve(lc, n_bins, statistic='mean'):
+    """
+    Bin ``lc`` in ``n_bins`` bins of equal width spanning its time (or phase, for a folded light
+    curve) range, as ``lc.bin(time_bin_size=range / n_bins)`` but computed with `np.bincount`
+    (see `_bin_statistics` for the available statistics and their uncertainties), and only for
+    the time, flux, and flux uncertainty columns.  Samples with non-finite flux are ignored.
+
+    Returns
+    -------
+    binned_lc : `~lightkurve.LightCurve`
+        Light curve of the same class as ``lc``, with the time at the center of each bin.
+    """
+    x, flux, flux_err = _bin_inputs(lc)
+    edges = _bin_edges(np.nanmin(x), np.nanmax(x), n_bins)
+    n_bins = len(edges) - 1
+    valid = np.isfinite(flux) & np.isfinite(x)
+    x, flux, flux_err = x[valid], flux[valid], flux_err[valid]
+    # bins include their lower edge (consistent with _BinPrefixSums), and the last sample (at the
+    # end of the range) is included in the last bin
+    bin_index = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, n_bins - 1)
+
+    ref = np.mean(flux) if len(flux) else 0.
+    sums = _bin_sums(bin_index, n_bins, flux, flux_err, ref)
+    median = _binned_median(bin_index, n_bins, flux) if statistic == 'median' else None
+    return _binned_light_curve(lc, edges, *_bin_statistics(sums, statistic, ref, median))
+
+
+class _BinPrefixSums:
+    """
+    Samples of a light curve sorted by time (or phase) with cumulative sums of the terms in
+    `_bin_sums`, so that binning in equal-width bins (as in `_bin_light_curve`) only costs a
+    ``searchsorted`` of the bin edges and differences of the cumulative sums at those indices,
+    independent of the number of samples (except for the median).
+
+    The cumulative sums are computed when first needed by a statistic.
+    """
+    def __init__(self, lc):
+        x, flux, flux_err = _bin_inputs(lc)
+        self.x_start, self.x_stop = np.nanmin(x), np.nanmax(x)
+        valid = np.isfinite(flux) & np.isfinite(x)
+        order = np.argsort(x[valid], kind='stable')
+        self.x = x[valid][order]
+        self.flux = flux[valid][order]
+        self.flux_err = flux_err[valid][order]
+        self.ref = np.mean(self.flux) if len(self.flux) else 0.
+        self.n_err = np.count_nonzero(np.isfinite(self.flux_err) & (self.flux_err > 0))
+        # empty light curve with the class, units, and meta of the output
+        self.template = lc[:0]
+        self._cumsums = {}
+
+    @property
+    def nbytes(self):
+        return (self.x.nbytes + self.flux.nbytes + self.flux_err.nbytes
+                + sum(cumsum.nbytes for cumsum in self._cumsums.values()))
+
+    def _cumsum(self, name):
+        if name not in self._cumsums:
+            valid_err = np.isfinite(self.flux_err) & (self.flux_err > 0)
+            dflux = self.flux - self.ref
+            if name == 'flux':
+                values = dflux
+            elif name == 'flux2':
+                values = dflux ** 2
+            elif name == 'n_err':
+                values = valid_err.astype(float)
+            elif name == 'err2':
+                values = np.where(valid_err, self.flux_err, 0) ** 2
+            elif name == 'weight':
+                values = np.where(valid_err, self.flux_err, np.inf) ** -2.0
+            elif name == 'weighted_flux':
+                values = np.where(valid_err, self.flux_err, np.inf) ** -2.0 * dflux
+            else:  # pragma: no cover
+                raise ValueError(f"unknown sum {name}")
+            self._cumsums[name] = np.concatenate([[0.], np.cumsum(values)])
+        return self._cumsums[name]
+
+    def bin(self, n_bins, statistic='mean'):
+        """
+        Equivalent to ``_bin_light_curve(lc, n_bins, statistic)``.
+        """
+        if statistic not in _BIN_STATISTICS:
+            raise ValueError(f"statistic must be one of {_BIN_STATISTICS}, not '{statistic}'")
+        edges = _bin_edges(self.x_start, self.x_stop, n_bins)
+        bounds = np.concatenate([[0],
+                                 np.searchsorted(self.x, edges[1:-1], side='left'),
+                                 [len(self.x)]])
+
+        # only the sums used by _bin_statistics for this statistic
+        sums = {'n': np.diff(bounds).astype(float)}
+        names = []
+        if self.n_err == len(self.x):
+            sums['n_err'] = sums['n']
+        elif self.n_err == 0:
+            sums['n_err'] = np.zeros_like(sums['n'])
+        else:
+            names += ['n_err']
+        if statistic == 'weighted mean':
+            names += ['weight', 'weighted_flux']
+        else:
+            if statistic == 'mean' or not self.n_err:
+                names += ['flux']
+            names += ['err2'] if self.n_err else ['flux2']
+        for name in names:
+            cumsum = self._cumsum(name)
+            sums[name] = cumsum[bounds[1:]] - cumsum[bounds[:-1]]
+
+        median = None
+        if statistic == 'median' and len(edges) - 1 <= len(self.x) // 100:
+            # the samples in each bin are contiguous, so partial sorts of each bin are faster than
+            # sorting all samples when there are many samples per bin
+            median = np.array([np.median(self.flux[start:stop]) if stop > start else np.nan
+                               for start, stop in zip(bounds[:-1], bounds[1:])])
+        elif statistic == 'median':
+            bin_index = np.repeat(np.arange(len(edges) - 1), np.diff(bounds))
+            median = _binned_median(bin_index, len(edges) - 1, self.flux)
+        return _binned_light_curve(self.template, edges,
+                                   *_bin_statistics(sums, statistic, self.ref, median))